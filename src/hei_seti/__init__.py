@@ -2,15 +2,50 @@
 
 from importlib import metadata
 
-from . import anomaly, data_sources, features, heuristics, pipeline, scales
+from . import (
+    anomaly,
+    barrow_sweep,
+    crossmatch,
+    data_sources,
+    distributed,
+    drift,
+    feature_cache,
+    features,
+    heuristics,
+    lightcurves,
+    online,
+    pipeline,
+    plotting,
+    profiling,
+    scales,
+    similarity,
+    stage_cache,
+    store,
+    sweep,
+    uncertainty,
+)
 
 __all__ = [
     "anomaly",
+    "barrow_sweep",
+    "crossmatch",
     "data_sources",
+    "distributed",
+    "drift",
+    "feature_cache",
     "features",
     "heuristics",
+    "lightcurves",
+    "online",
     "pipeline",
+    "plotting",
+    "profiling",
     "scales",
+    "similarity",
+    "stage_cache",
+    "store",
+    "sweep",
+    "uncertainty",
     "__version__",
 ]
 
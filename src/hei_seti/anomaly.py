@@ -2,64 +2,226 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass, field
+from dataclasses import MISSING, dataclass, field, fields
 
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed, parallel_config
+from scipy.stats import rankdata
 from sklearn.ensemble import IsolationForest
 
+from .drift import DriftReference
+
 LOGGER = logging.getLogger(__name__)
 
 FEATURE_COLUMNS = ["flux", "hardness", "period", "bh_mass", "var_ratio", "K", "B"]
 
 
+def feature_matrix(df: pd.DataFrame) -> np.ndarray:
+    """Return the float feature matrix for `df` with non-finite values zeroed."""
+
+    missing = [column for column in FEATURE_COLUMNS if column not in df]
+    if missing:
+        raise KeyError(f"Missing feature columns: {missing}")
+    matrix = df[FEATURE_COLUMNS].astype(float).to_numpy()
+    return np.nan_to_num(matrix, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def _fit_forest(matrix: np.ndarray, seed: int | None, **params) -> IsolationForest:
+    return IsolationForest(random_state=seed, **params).fit(matrix)
+
+
 @dataclass(slots=True)
 class AnomalyModel:
-    """Wrapper around scikit-learn IsolationForest with structured logging."""
+    """Wrapper around scikit-learn IsolationForest with structured logging.
+
+    `fit` and `score` accept either a feature dataframe or a matrix already prepared by
+    `feature_matrix` (for example a memory-mapped `FeatureCache` entry).
+
+    With `ensemble_size > 1` the model trains that many forests seeded `random_state`,
+    `random_state + 1`, ... in a process pool, and `score` returns their mean score.
+    Artifacts pickled before a field existed load with that field at its default.
+    """
 
     contamination: float = 0.05
     random_state: int | None = None
+    n_estimators: int = 100
+    max_samples: int | float | str = "auto"
+    ensemble_size: int = 1
+    n_jobs: int | None = None
     _model: IsolationForest | None = field(default=None, init=False, repr=False)
+    _ensemble: list[IsolationForest] = field(default_factory=list, init=False, repr=False)
+    _drift: DriftReference | None = field(default=None, init=False, repr=False)
+
+    def __setstate__(self, state: dict | tuple) -> None:
+        # Slotted instances pickle as `(None, {slot: value})`, holding only the slots that
+        # existed when the artifact was written.
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **(state[1] or {})}
+        for item in fields(self):
+            if item.name in state:
+                value = state[item.name]
+            elif item.default_factory is not MISSING:
+                value = item.default_factory()
+            else:
+                value = item.default
+            object.__setattr__(self, item.name, value)
+        if not self._ensemble and self._model is not None:
+            self._ensemble = [self._model]
 
-    def _prepare(self, df: pd.DataFrame) -> np.ndarray:
-        missing = [column for column in FEATURE_COLUMNS if column not in df]
-        if missing:
-            raise KeyError(f"Missing feature columns: {missing}")
-        matrix = df[FEATURE_COLUMNS].astype(float).to_numpy()
-        return np.nan_to_num(matrix, nan=0.0, posinf=0.0, neginf=0.0)
+    @property
+    def is_ensemble(self) -> bool:
+        """Whether scores come from several forests (and carry spread columns)."""
 
-    def fit(self, df: pd.DataFrame) -> IsolationForest:
+        return len(self._ensemble) > 1
+
+    def _prepare(self, data: pd.DataFrame | np.ndarray) -> np.ndarray:
+        if isinstance(data, np.ndarray):
+            return data
+        return feature_matrix(data)
+
+    def _seeds(self) -> list[int | None]:
+        if self.random_state is None:
+            return [None] * self.ensemble_size
+        return [self.random_state + offset for offset in range(self.ensemble_size)]
+
+    def fit(self, df: pd.DataFrame | np.ndarray) -> IsolationForest:
         matrix = self._prepare(df)
         LOGGER.info(
             "anomaly.fit.start",
-            extra={"extra_data": {"rows": len(df), "contamination": self.contamination}},
-        )
-        self._model = IsolationForest(
-            contamination=self.contamination,
-            random_state=self.random_state,
+            extra={
+                "extra_data": {
+                    "rows": len(matrix),
+                    "contamination": self.contamination,
+                    "n_estimators": self.n_estimators,
+                    "max_samples": self.max_samples,
+                    "ensemble_size": self.ensemble_size,
+                }
+            },
         )
-        self._model.fit(matrix)
+        params = {
+            "contamination": self.contamination,
+            "n_estimators": self.n_estimators,
+            "max_samples": self.max_samples,
+        }
+        seeds = self._seeds()
+        if len(seeds) == 1:
+            self._ensemble = [_fit_forest(matrix, seeds[0], **params)]
+        else:
+            with parallel_config(backend="loky", inner_max_num_threads=1):
+                self._ensemble = Parallel(n_jobs=self.n_jobs, mmap_mode="r")(
+                    delayed(_fit_forest)(matrix, seed, **params) for seed in seeds
+                )
+        self._model = self._ensemble[0]
+        self._drift = DriftReference.from_matrix(matrix, FEATURE_COLUMNS)
         LOGGER.info(
             "anomaly.fit.finish",
-            extra={"extra_data": {"estimators": len(self._model.estimators_)}}
+            extra={
+                "extra_data": {
+                    "estimators": sum(len(forest.estimators_) for forest in self._ensemble),
+                    "forests": len(self._ensemble),
+                }
+            },
         )
         return self._model
 
-    def score(self, df: pd.DataFrame) -> pd.Series:
+    def score(self, df: pd.DataFrame | np.ndarray) -> pd.Series:
         if self._model is None:
             raise RuntimeError("Model has not been fit")
+        if self.is_ensemble:
+            return self.score_ensemble(df)["anomaly"]
         matrix = self._prepare(df)
         raw_scores = -self._model.score_samples(matrix)
         LOGGER.info(
             "anomaly.score",
-            extra={"extra_data": {"rows": len(df), "score_mean": float(np.mean(raw_scores))}},
+            extra={"extra_data": {"rows": len(matrix), "score_mean": float(np.mean(raw_scores))}},
         )
-        return pd.Series(raw_scores, index=df.index, name="anomaly")
+        index = df.index if isinstance(df, pd.DataFrame) else None
+        return pd.Series(raw_scores, index=index, name="anomaly")
+
+    def drift(self, df: pd.DataFrame | np.ndarray) -> dict[str, float]:
+        """Population stability index of each feature relative to the training data.
+
+        Models trained before drift tracking have no reference and report no drift.
+        """
+
+        if self._model is None:
+            raise RuntimeError("Model has not been fit")
+        if self._drift is None:
+            LOGGER.warning("anomaly.drift.unavailable")
+            return {}
+        return self._drift.psi(self._prepare(df))
+
+    def drift_p_values(self, df: pd.DataFrame | np.ndarray) -> dict[str, float]:
+        """Chi-square p-value of each feature's binned distribution against the training data."""
+
+        if self._model is None:
+            raise RuntimeError("Model has not been fit")
+        if self._drift is None:
+            return {}
+        return self._drift.p_values(self._prepare(df))
+
+    def score_ensemble(
+        self, df: pd.DataFrame | np.ndarray, chunk_size: int = 65536
+    ) -> pd.DataFrame:
+        """Score every ensemble member in one pass over row chunks of a single matrix.
+
+        Returns the mean score (`anomaly`), its spread across members (`anomaly_std`), and
+        the variance of each row's rank across members (`rank_var`).
+        """
+
+        if self._model is None:
+            raise RuntimeError("Model has not been fit")
+        matrix = self._prepare(df)
+        member_scores = np.empty((len(matrix), len(self._ensemble)), dtype=float)
+        for start in range(0, len(matrix), chunk_size):
+            chunk = np.asarray(matrix[start : start + chunk_size])
+            for column, forest in enumerate(self._ensemble):
+                member_scores[start : start + len(chunk), column] = -forest.score_samples(chunk)
+        ranks = rankdata(-member_scores, axis=0, method="average")
+        index = df.index if isinstance(df, pd.DataFrame) else None
+        result = pd.DataFrame(
+            {
+                "anomaly": member_scores.mean(axis=1),
+                "anomaly_std": member_scores.std(axis=1),
+                "rank_var": ranks.var(axis=1),
+            },
+            index=index,
+        )
+        LOGGER.info(
+            "anomaly.score_ensemble",
+            extra={
+                "extra_data": {
+                    "rows": len(matrix),
+                    "forests": len(self._ensemble),
+                    "score_mean": float(result["anomaly"].mean()) if len(result) else 0.0,
+                    "rank_var_mean": float(result["rank_var"].mean()) if len(result) else 0.0,
+                }
+            },
+        )
+        return result
+
+    def rank(
+        self,
+        df: pd.DataFrame,
+        top: int = 50,
+        scores: pd.Series | pd.DataFrame | np.ndarray | None = None,
+    ) -> pd.DataFrame:
+        """Return the `top` rows of `df` by anomaly score.
+
+        Pass `scores` (aligned positionally with `df`) to reuse scores that were already
+        computed, e.g. from a cached feature matrix. A dataframe from `score_ensemble`
+        contributes all of its columns to the result.
+        """
 
-    def rank(self, df: pd.DataFrame, top: int = 50) -> pd.DataFrame:
-        scores = self.score(df)
+        if scores is None:
+            scores = self.score_ensemble(df) if self.is_ensemble else self.score(df)
         ranked = df.copy()
-        ranked["anomaly"] = scores
+        if isinstance(scores, pd.DataFrame):
+            for column in scores.columns:
+                ranked[column] = scores[column].to_numpy()
+        else:
+            ranked["anomaly"] = np.asarray(scores)
         ranked["rank"] = ranked["anomaly"].rank(ascending=False, method="first")
         LOGGER.info(
             "anomaly.rank",
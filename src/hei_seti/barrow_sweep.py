@@ -0,0 +1,107 @@
+"""Sensitivity sweeps over the Barrow level thresholds."""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field, replace
+from typing import Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+
+from .anomaly import FEATURE_COLUMNS, AnomalyModel, feature_matrix
+from .heuristics import BARROW_THRESHOLD_FIELDS, BarrowThresholds, barrow_levels
+from .scales import BarrowLevel
+from .sweep import expand_grid
+
+LOGGER = logging.getLogger(__name__)
+
+# Levels the Barrow rules can assign; `barrow_levels` never returns anything else.
+SWEEP_LEVELS = (BarrowLevel.BIII, BarrowLevel.BIV, BarrowLevel.BV, BarrowLevel.BOMEGA)
+BARROW_INPUTS = ("bh_mass", "var_ratio", "hardness")
+
+
+@dataclass(slots=True)
+class BarrowSweep:
+    """Evaluate Barrow levels for every threshold set in a grid without re-featurizing.
+
+    Threshold sets are stacked into `(sets, 1)` arrays and broadcast against the feature
+    columns, in batches of at most `max_elements` set × row cells. Fields missing from
+    `grid` keep their `baseline` value.
+
+    With a model, candidate shifts are measured without re-scoring per set: the catalogue
+    is scored once for each possible level (B is a model feature), and every set's scores
+    are gathered from those four passes by its assigned levels. This is what re-featurizing
+    and re-scoring with that set would produce, short of retraining the model.
+    """
+
+    grid: Mapping[str, Iterable[float]]
+    baseline: BarrowThresholds = field(default_factory=BarrowThresholds)
+    top_k: int = 50
+    max_elements: int = 1 << 24
+
+    def threshold_sets(self) -> list[BarrowThresholds]:
+        combos = expand_grid(self.grid, allowed=BARROW_THRESHOLD_FIELDS)
+        return [replace(self.baseline, **combo) for combo in combos]
+
+    def _level_scores(self, features: pd.DataFrame, model: AnomalyModel) -> np.ndarray:
+        matrix = feature_matrix(features).copy()
+        column = FEATURE_COLUMNS.index("B")
+        scores = np.empty((len(SWEEP_LEVELS), len(matrix)))
+        for position, level in enumerate(SWEEP_LEVELS):
+            matrix[:, column] = int(level)
+            scores[position] = np.asarray(model.score(matrix), dtype=float)
+        return scores
+
+    def run(self, features: pd.DataFrame, model: AnomalyModel | None = None) -> pd.DataFrame:
+        """Return one report row per threshold set with level populations and top-K shift."""
+
+        sets = self.threshold_sets()
+        columns = {
+            name: pd.to_numeric(features[name], errors="coerce").to_numpy(dtype=float)
+            for name in BARROW_INPUTS
+            if name in features
+        }
+        rows = len(features)
+        baseline_levels = np.broadcast_to(barrow_levels(columns, self.baseline), (rows,))
+        LOGGER.info(
+            "barrow_sweep.start",
+            extra={"extra_data": {"rows": rows, "threshold_sets": len(sets)}},
+        )
+
+        top_k = min(self.top_k, rows)
+        level_scores = baseline_top = None
+        if model is not None and top_k > 0:
+            level_scores = self._level_scores(features, model)
+            baseline_scores = level_scores[baseline_levels - int(SWEEP_LEVELS[0]), np.arange(rows)]
+            baseline_top = np.zeros(rows, dtype=bool)
+            baseline_top[np.argpartition(-baseline_scores, top_k - 1)[:top_k]] = True
+
+        batch = max(1, self.max_elements // max(rows, 1))
+        records = []
+        for start in range(0, len(sets), batch):
+            chunk = sets[start : start + batch]
+            stacked = BarrowThresholds(
+                **{
+                    name: np.array([getattr(item, name) for item in chunk], dtype=float)[:, None]
+                    for name in BARROW_THRESHOLD_FIELDS
+                }
+            )
+            levels = np.broadcast_to(barrow_levels(columns, stacked), (len(chunk), rows))
+            stats = {
+                f"n_{level.name}": (levels == level).sum(axis=1) for level in SWEEP_LEVELS
+            }
+            stats["n_changed"] = (levels != baseline_levels).sum(axis=1)
+            if level_scores is not None:
+                gathered = level_scores[levels - int(SWEEP_LEVELS[0]), np.arange(rows)]
+                top = np.argpartition(-gathered, top_k - 1, axis=1)[:, :top_k]
+                kept = baseline_top[top].sum(axis=1)
+                stats["topk_overlap"] = kept / (2 * top_k - kept)
+                stats["topk_entered"] = top_k - kept
+            for position, item in enumerate(chunk):
+                record = {name: getattr(item, name) for name in BARROW_THRESHOLD_FIELDS}
+                record.update({key: value[position].item() for key, value in stats.items()})
+                records.append(record)
+
+        report = pd.DataFrame.from_records(records)
+        LOGGER.info("barrow_sweep.finish", extra={"extra_data": {"threshold_sets": len(report)}})
+        return report
@@ -2,13 +2,12 @@
 from __future__ import annotations
 
 import argparse
+from datetime import datetime
 from pathlib import Path
 
-import matplotlib.pyplot as plt
-import pandas as pd
-
 from .logging_conf import setup_logging
 from .pipeline import Pipeline
+from .plotting import plot_kb_space
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -20,11 +19,42 @@ def build_parser() -> argparse.ArgumentParser:
     fetch_parser = subparsers.add_parser("fetch", help="Fetch HEASARC tables")
     fetch_parser.add_argument("--tables", nargs="*", help="Override tables to fetch")
     fetch_parser.add_argument("--output", default="data/raw.parquet")
+    fetch_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Fetch again even if the stage cache holds this fetch",
+    )
+
+    crossmatch_parser = subparsers.add_parser(
+        "crossmatch", help="Merge counterparts of the same source across catalogues"
+    )
+    crossmatch_parser.add_argument("--input", default="data/raw.parquet")
+    crossmatch_parser.add_argument("--output", default="data/matched.parquet")
+
+    profile_parser = subparsers.add_parser(
+        "profile", help="Profile null rates, ranges and quantiles in one streaming pass"
+    )
+    profile_parser.add_argument("--input", default="data/raw.parquet")
+    profile_parser.add_argument("--output", default=None, help="JSON report path")
+    profile_parser.add_argument("--n-jobs", type=int, default=None)
 
     featurize_parser = subparsers.add_parser("featurize", help="Engineer features and KB metrics")
     featurize_parser.add_argument("--input", default="data/raw.parquet")
     featurize_parser.add_argument("--output", default="data/features.parquet")
 
+    uncertainty_parser = subparsers.add_parser(
+        "uncertainty", help="Monte Carlo Kardashev uncertainty per source"
+    )
+    uncertainty_parser.add_argument("--input", default="data/raw.parquet")
+    uncertainty_parser.add_argument("--output", default="results/kardashev_uncertainty.parquet")
+
+    lightcurves_parser = subparsers.add_parser(
+        "lightcurves", help="Extract variability and period features from light curves"
+    )
+    lightcurves_parser.add_argument("--input-dir", default=None, help="Light-curve directory")
+    lightcurves_parser.add_argument("--output", default=None)
+    lightcurves_parser.add_argument("--n-jobs", type=int, default=None)
+
     train_parser = subparsers.add_parser("train", help="Train the anomaly detector")
     train_parser.add_argument("--input", default="data/features.parquet")
     train_parser.add_argument("--model", default="models/iforest.joblib")
@@ -35,10 +65,87 @@ def build_parser() -> argparse.ArgumentParser:
     score_parser.add_argument("--output", default="results/candidates.csv")
     score_parser.add_argument("--top", type=int, default=50)
 
+    neighbors_parser = subparsers.add_parser(
+        "neighbors", help="Find catalogue systems most similar to given sources"
+    )
+    neighbors_parser.add_argument("--model", default="models/iforest.joblib")
+    neighbors_parser.add_argument("--name", action="append", default=[], help="Source name")
+    neighbors_parser.add_argument(
+        "--candidates", default=None, help="Query every source in a candidates CSV"
+    )
+    neighbors_parser.add_argument("--k", type=int, default=10)
+    neighbors_parser.add_argument("--output", default=None, help="Optional CSV output")
+
+    update_parser = subparsers.add_parser(
+        "update", help="Score newly fetched sources and merge them into the candidates"
+    )
+    update_parser.add_argument("--model", required=True)
+    update_parser.add_argument("--input", default="data/new_raw.parquet")
+    update_parser.add_argument("--candidates", default="results/candidates.csv")
+    update_parser.add_argument("--top", type=int, default=None)
+
+    sweep_parser = subparsers.add_parser("sweep", help="Sweep anomaly hyperparameters")
+    sweep_parser.add_argument("--input", default="data/features.parquet")
+    sweep_parser.add_argument("--output", default="results/sweep.csv")
+    sweep_parser.add_argument("--n-jobs", type=int, default=None)
+
+    barrow_sweep_parser = subparsers.add_parser(
+        "barrow-sweep", help="Sweep Barrow level thresholds over existing features"
+    )
+    barrow_sweep_parser.add_argument("--input", default="data/features.parquet")
+    barrow_sweep_parser.add_argument(
+        "--model", default=None, help="Model used to report top-candidate shifts"
+    )
+    barrow_sweep_parser.add_argument("--output", default="results/barrow_sweep.csv")
+
+    query_parser = subparsers.add_parser(
+        "query", help="Filter and page through stored features or scores"
+    )
+    query_parser.add_argument("table", nargs="?", default="scores", choices=["scores", "features"])
+    query_parser.add_argument(
+        "--filter",
+        action="append",
+        default=[],
+        help='Column comparison such as "K > 0.5" or "B = 6" (repeatable)',
+    )
+    query_parser.add_argument(
+        "--order", default=None, help="Column, prefix - to descend (scores: -anomaly)"
+    )
+    query_parser.add_argument("--limit", type=int, default=50)
+    query_parser.add_argument("--offset", type=int, default=0)
+    query_parser.add_argument("--run", default=None, help="Run id (defaults to the latest)")
+    query_parser.add_argument("--output", default=None, help="Optional CSV output")
+
+    submit_parser = subparsers.add_parser(
+        "submit", help="Split featurize or score work into tasks for distributed workers"
+    )
+    submit_parser.add_argument("stage", choices=["featurize", "score"])
+    submit_parser.add_argument("--input", required=True)
+    submit_parser.add_argument("--model", default=None, help="Model path (score only)")
+    submit_parser.add_argument("--partitions", type=int, default=None)
+
+    worker_parser = subparsers.add_parser("worker", help="Claim and run distributed tasks")
+    worker_parser.add_argument("--poll", type=float, default=1.0, help="Seconds between polls")
+    worker_parser.add_argument(
+        "--idle-timeout", type=float, default=None, help="Exit after this many idle seconds"
+    )
+
+    collect_parser = subparsers.add_parser("collect", help="Merge a finished distributed job")
+    collect_parser.add_argument("--job", required=True)
+    collect_parser.add_argument("--output", required=True)
+    collect_parser.add_argument("--top", type=int, default=50)
+
+    cache_parser = subparsers.add_parser("cache", help="Inspect or prune the stage cache")
+    cache_parser.add_argument("action", choices=["ls", "gc", "clear"])
+    cache_parser.add_argument(
+        "--max-bytes", type=int, default=None, help="Size bound for gc (defaults to config)"
+    )
+
     plot_parser = subparsers.add_parser("plot", help="Visualise KB space")
     plot_parser.add_argument("--input", default="data/features.parquet")
     plot_parser.add_argument("--candidates", default="results/candidates.csv")
     plot_parser.add_argument("--output", default="results/kb_space.png")
+    plot_parser.add_argument("--bins", type=int, default=200, help="Number of Kardashev bins")
 
     return parser
 
@@ -55,15 +162,37 @@ def main(argv: list[str] | None = None) -> int:
     pipeline = _load_pipeline(args.config)
 
     if args.command == "fetch":
-        df = pipeline.fetch(tables=args.tables, output=args.output)
+        df = pipeline.fetch(tables=args.tables, output=args.output, refresh=args.refresh)
         print(f"Fetched {len(df)} rows -> {args.output}")
         return 0
 
+    if args.command == "crossmatch":
+        df = pipeline.crossmatch(input_path=args.input, output=args.output)
+        print(f"Cross-matched into {len(df)} sources -> {args.output}")
+        return 0
+
+    if args.command == "profile":
+        report = pipeline.profile(input_path=args.input, output=args.output, n_jobs=args.n_jobs)
+        print(f"Profile {report['run_id']} -> {report['output']}")
+        return 0
+
     if args.command == "featurize":
         df = pipeline.featurize(input_path=args.input, output=args.output)
         print(f"Featurized {len(df)} rows -> {args.output}")
         return 0
 
+    if args.command == "lightcurves":
+        table = pipeline.lightcurves(
+            directory=args.input_dir, output=args.output, n_jobs=args.n_jobs
+        )
+        print(f"Extracted light-curve features for {len(table)} sources")
+        return 0
+
+    if args.command == "uncertainty":
+        result = pipeline.uncertainty(input_path=args.input, output=args.output)
+        print(f"Sampled K for {len(result)} sources -> {args.output}")
+        return 0
+
     if args.command == "train":
         model_path = pipeline.train(input_path=args.input, model_path=args.model)
         print(f"Model saved to {model_path}")
@@ -79,20 +208,109 @@ def main(argv: list[str] | None = None) -> int:
         print(f"Wrote top {len(scores)} candidates -> {args.output}")
         return 0
 
+    if args.command == "neighbors":
+        if not args.name and not args.candidates:
+            parser.error("neighbors requires --name or --candidates")
+        result = pipeline.neighbors(
+            model_path=args.model, names=args.name, candidates=args.candidates, k=args.k
+        )
+        if args.output:
+            Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+            result.to_csv(args.output, index=False)
+            print(f"Wrote {len(result)} neighbours -> {args.output}")
+        else:
+            print(result.to_string(index=False))
+        return 0
+
+    if args.command == "update":
+        result = pipeline.update(
+            model_path=args.model,
+            input_path=args.input,
+            candidates=args.candidates,
+            top=args.top,
+        )
+        print(
+            f"Scored {len(result.scored)} new rows; {len(result.candidates)} candidates"
+            f" -> {args.candidates}"
+        )
+        if result.insufficient:
+            print("Drift check skipped: insufficient data in this batch")
+        elif result.retrain:
+            drifted = ", ".join(result.drifted)
+            print(f"Feature drift detected; full retrain recommended ({drifted})")
+        return 0
+
+    if args.command == "sweep":
+        report = pipeline.sweep(input_path=args.input, output=args.output, n_jobs=args.n_jobs)
+        print(f"Swept {len(report)} configurations -> {args.output}")
+        return 0
+
+    if args.command == "barrow-sweep":
+        report = pipeline.barrow_sweep(
+            model_path=args.model, input_path=args.input, output=args.output
+        )
+        print(f"Swept {len(report)} Barrow threshold sets -> {args.output}")
+        return 0
+
+    if args.command == "query":
+        order = args.order or ("-anomaly" if args.table == "scores" else None)
+        try:
+            result = pipeline.query(
+                args.table,
+                filters=args.filter,
+                order=order,
+                limit=args.limit,
+                offset=args.offset,
+                run_id=args.run,
+            )
+        except ValueError as error:
+            parser.error(str(error))
+        if args.output:
+            Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+            result.to_csv(args.output, index=False)
+            print(f"Wrote {len(result)} rows -> {args.output}")
+        else:
+            print(result.to_string(index=False))
+        return 0
+
+    if args.command == "submit":
+        job_id = pipeline.submit(
+            args.stage, input_path=args.input, model_path=args.model, partitions=args.partitions
+        )
+        print(job_id)
+        return 0
+
+    if args.command == "worker":
+        processed = pipeline.work(poll_interval=args.poll, idle_timeout=args.idle_timeout)
+        print(f"Processed {processed} tasks")
+        return 0
+
+    if args.command == "collect":
+        result = pipeline.collect(args.job, output=args.output, top=args.top)
+        print(f"Collected {len(result)} rows -> {args.output}")
+        return 0
+
+    if args.command == "cache":
+        cache = pipeline.stage_cache()
+        if cache is None:
+            print("Stage cache is disabled (set stage_cache.dir in the config)")
+            return 0
+        if args.action == "ls":
+            entries = cache.entries()
+            for entry in entries:
+                last_used = datetime.fromtimestamp(entry["last_used"]).isoformat(timespec="seconds")
+                print(f"{entry['stage']:<10} {entry['key'][:12]} {entry['bytes']:>12} {last_used}")
+            total = sum(entry["bytes"] for entry in entries)
+            print(f"{len(entries)} entries, {total} bytes")
+        elif args.action == "gc":
+            evicted = cache.gc(args.max_bytes)
+            print(f"Evicted {len(evicted)} entries")
+        else:
+            print(f"Removed {cache.clear()} entries")
+        return 0
+
     if args.command == "plot":
-        features = pd.read_parquet(args.input)
-        candidates = pd.read_csv(args.candidates) if Path(args.candidates).exists() else None
-        fig, ax = plt.subplots(figsize=(8, 6))
-        ax.scatter(features["K"], features["B"], alpha=0.3, label="catalogue")
-        if candidates is not None:
-            ax.scatter(candidates["K"], candidates["B"], marker="x", s=80, label="candidates")
-        ax.set_xlabel("Kardashev K")
-        ax.set_ylabel("Barrow level")
-        ax.set_title("K×B candidate landscape")
-        ax.legend()
-        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
-        fig.tight_layout()
-        fig.savefig(args.output)
+        plot_kb_space(args.input, args.output, candidates_path=args.candidates, k_bins=args.bins)
         print(f"Plot saved -> {args.output}")
         return 0
 
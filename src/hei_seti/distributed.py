@@ -0,0 +1,358 @@
+"""Partitioned task distribution for featurize and score work across worker processes."""
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import socket
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, Mapping, Protocol
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+LOGGER = logging.getLogger(__name__)
+
+TaskHandler = Callable[[dict, dict], None]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL REFERENCES jobs(job_id),
+    partition INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_until REAL,
+    error TEXT,
+    UNIQUE (job_id, partition)
+);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, lease_until);
+"""
+
+
+class DistributedJobError(RuntimeError):
+    """Raised when a distributed job cannot be collected."""
+
+
+@dataclass(slots=True)
+class Task:
+    """A claimed unit of work: one partition of one job."""
+
+    task_id: int
+    job_id: str
+    kind: str
+    partition: int
+    payload: dict
+    attempts: int
+    worker: str = ""
+
+
+class TaskBroker(Protocol):
+    """Interface a broker must provide for `Worker` and `Pipeline.submit`/`collect`."""
+
+    def publish(self, job_id: str, kind: str, payloads: list[dict], metadata: dict) -> None: ...
+
+    def claim(self, worker: str, lease_seconds: float) -> Task | None: ...
+
+    def complete(self, task: Task) -> bool: ...
+
+    def fail(self, task: Task, error: str) -> None: ...
+
+    def job(self, job_id: str) -> dict: ...
+
+    def status(self, job_id: str) -> dict[str, int]: ...
+
+    def payloads(self, job_id: str) -> list[dict]: ...
+
+
+@dataclass(slots=True)
+class SQLiteBroker:
+    """Task broker backed by a single SQLite file; needs no external services.
+
+    Claims take a `BEGIN IMMEDIATE` write lock, so concurrent workers never receive the same
+    pending task. A claimed task holds a lease; when it expires (the worker died or stalled)
+    the task becomes claimable again until `max_attempts` is reached. Completions and
+    failures only count for the worker and attempt that hold the current lease. For
+    multi-node use, place the file on shared storage with working POSIX locks.
+    """
+
+    path: str | Path
+    max_attempts: int = 3
+
+    def __post_init__(self) -> None:
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Autocommit mode with explicit BEGIN/COMMIT; closing mid-transaction rolls back.
+        connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def publish(self, job_id: str, kind: str, payloads: list[dict], metadata: dict) -> None:
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute(
+                "INSERT INTO jobs (job_id, kind, metadata, created) VALUES (?, ?, ?, ?)",
+                (job_id, kind, json.dumps(metadata, default=str), time.time()),
+            )
+            connection.executemany(
+                "INSERT INTO tasks (job_id, partition, payload) VALUES (?, ?, ?)",
+                [
+                    (job_id, partition, json.dumps(payload, default=str))
+                    for partition, payload in enumerate(payloads)
+                ],
+            )
+            connection.execute("COMMIT")
+        LOGGER.info(
+            "broker.publish",
+            extra={"extra_data": {"job_id": job_id, "kind": kind, "tasks": len(payloads)}},
+        )
+
+    def claim(self, worker: str, lease_seconds: float) -> Task | None:
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute(
+                "UPDATE tasks SET status = 'failed', error = COALESCE(error, 'lease expired')"
+                " WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                (now, self.max_attempts),
+            )
+            row = connection.execute(
+                "SELECT t.task_id, t.job_id, j.kind, t.partition, t.payload, t.attempts"
+                " FROM tasks t JOIN jobs j USING (job_id)"
+                " WHERE t.status = 'pending' OR (t.status = 'running' AND t.lease_until < ?)"
+                " ORDER BY t.task_id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                connection.execute("COMMIT")
+                return None
+            connection.execute(
+                "UPDATE tasks SET status = 'running', attempts = attempts + 1, worker = ?,"
+                " lease_until = ? WHERE task_id = ?",
+                (worker, now + lease_seconds, row["task_id"]),
+            )
+            connection.execute("COMMIT")
+        return Task(
+            task_id=row["task_id"],
+            job_id=row["job_id"],
+            kind=row["kind"],
+            partition=row["partition"],
+            payload=json.loads(row["payload"]),
+            attempts=row["attempts"] + 1,
+            worker=worker,
+        )
+
+    def complete(self, task: Task) -> bool:
+        """Mark `task` done; return False if its lease has passed to another attempt."""
+
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "UPDATE tasks SET status = 'done', lease_until = NULL, error = NULL"
+                " WHERE task_id = ? AND status = 'running' AND worker = ? AND attempts = ?",
+                (task.task_id, task.worker, task.attempts),
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, task: Task, error: str) -> None:
+        status = "failed" if task.attempts >= self.max_attempts else "pending"
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE tasks SET status = ?, lease_until = NULL, error = ?"
+                " WHERE task_id = ? AND status = 'running' AND worker = ? AND attempts = ?",
+                (status, error, task.task_id, task.worker, task.attempts),
+            )
+
+    def job(self, job_id: str) -> dict:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT kind, metadata FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown job: {job_id}")
+        return {"kind": row["kind"], **json.loads(row["metadata"])}
+
+    def status(self, job_id: str) -> dict[str, int]:
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT status, COUNT(*) AS n FROM tasks WHERE job_id = ? GROUP BY status",
+                (job_id,),
+            ).fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def payloads(self, job_id: str) -> list[dict]:
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT payload FROM tasks WHERE job_id = ? ORDER BY partition", (job_id,)
+            ).fetchall()
+        return [json.loads(row["payload"]) for row in rows]
+
+
+# Broker backends selectable with `distributed.backend`. Each is called with the
+# `distributed.broker` location and `max_attempts`; register new backends here.
+BROKERS: dict[str, Callable[..., TaskBroker]] = {"sqlite": SQLiteBroker}
+
+
+def split_parquet(input_path: str | Path, directory: str | Path, partitions: int) -> list[dict]:
+    """Stream `input_path` into up to `partitions` contiguous Parquet files.
+
+    Returns one `{"input", "start"}` descriptor per partition, where `start` is the global
+    row offset so workers can keep row positions stable.
+    """
+
+    parquet = pq.ParquetFile(input_path)
+    rows = parquet.metadata.num_rows
+    per_partition = max(1, math.ceil(rows / max(1, partitions)))
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    descriptors: list[dict] = []
+    writer: pq.ParquetWriter | None = None
+    filled = per_partition
+    for batch in parquet.iter_batches(batch_size=min(per_partition, 65536)):
+        offset = 0
+        while offset < batch.num_rows:
+            if filled == per_partition:
+                if writer is not None:
+                    writer.close()
+                path = directory / f"input-{len(descriptors):05d}.parquet"
+                writer = pq.ParquetWriter(path, parquet.schema_arrow)
+                descriptors.append({"input": str(path), "start": len(descriptors) * per_partition})
+                filled = 0
+            take = min(per_partition - filled, batch.num_rows - offset)
+            writer.write_batch(batch.slice(offset, take))
+            filled += take
+            offset += take
+    if writer is not None:
+        writer.close()
+    return descriptors
+
+
+def write_atomic(frame: pd.DataFrame, path: str | Path) -> None:
+    """Write a Parquet file via rename so re-runs of a task are idempotent."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".parquet.tmp")
+    os.close(fd)
+    try:
+        frame.to_parquet(tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+@dataclass(slots=True)
+class Worker:
+    """Claim tasks from a broker and run them with the handler registered for their kind."""
+
+    broker: TaskBroker
+    handlers: Mapping[str, TaskHandler]
+    name: str = field(default_factory=lambda: f"{socket.gethostname()}:{os.getpid()}")
+    lease_seconds: float = 600.0
+
+    def run_once(self) -> bool:
+        """Claim and run one task; return False when nothing was claimable."""
+
+        task = self.broker.claim(self.name, self.lease_seconds)
+        if task is None:
+            return False
+        job = self.broker.job(task.job_id)
+        LOGGER.info(
+            "worker.task.start",
+            extra={
+                "extra_data": {
+                    "worker": self.name,
+                    "job_id": task.job_id,
+                    "kind": task.kind,
+                    "partition": task.partition,
+                    "attempt": task.attempts,
+                }
+            },
+        )
+        try:
+            self.handlers[task.kind](job, task.payload)
+        except Exception as error:  # noqa: BLE001 - any task failure is retried
+            LOGGER.warning(
+                "worker.task.error",
+                extra={
+                    "extra_data": {
+                        "job_id": task.job_id,
+                        "partition": task.partition,
+                        "error": repr(error),
+                    }
+                },
+            )
+            self.broker.fail(task, repr(error))
+        else:
+            if not self.broker.complete(task):
+                # The lease expired and the task was handed on; that attempt owns the result.
+                LOGGER.warning(
+                    "worker.task.conflict",
+                    extra={
+                        "extra_data": {
+                            "worker": self.name,
+                            "job_id": task.job_id,
+                            "partition": task.partition,
+                            "attempt": task.attempts,
+                        }
+                    },
+                )
+        return True
+
+    def run(
+        self, poll_interval: float = 1.0, idle_timeout: float | None = None
+    ) -> int:
+        """Process tasks until idle for `idle_timeout` seconds (forever when None)."""
+
+        processed = 0
+        idle_since = time.monotonic()
+        while True:
+            if self.run_once():
+                processed += 1
+                idle_since = time.monotonic()
+                continue
+            if idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+                return processed
+            time.sleep(poll_interval)
+
+
+def collect_outputs(broker: TaskBroker, job_id: str) -> pd.DataFrame:
+    """Concatenate a finished job's partition outputs in partition order."""
+
+    status = broker.status(job_id)
+    unfinished = {state: count for state, count in status.items() if state != "done"}
+    if unfinished:
+        raise DistributedJobError(f"Job {job_id} is not complete: {unfinished}")
+    frames = [pd.read_parquet(payload["output"]) for payload in broker.payloads(job_id)]
+    return pd.concat(frames) if frames else pd.DataFrame()
+
+
+def default_payloads(descriptors: list[dict], directory: str | Path, kind: str) -> list[dict]:
+    """Attach a deterministic output path to each partition descriptor."""
+
+    directory = Path(directory)
+    return [
+        {**descriptor, "output": str(directory / f"{kind}-{partition:05d}.parquet")}
+        for partition, descriptor in enumerate(descriptors)
+    ]
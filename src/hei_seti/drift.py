@@ -0,0 +1,78 @@
+"""Feature distribution drift detection via the population stability index."""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.stats import chi2
+
+LOGGER = logging.getLogger(__name__)
+
+PSI_EPSILON = 1e-4
+# Pseudo-count added to every bin of a scored batch, so empty bins in small batches do not
+# dominate the index; its weight shrinks as the batch grows.
+PSI_PSEUDO_COUNT = 0.5
+
+
+@dataclass(slots=True)
+class DriftReference:
+    """Quantile-binned snapshot of a feature matrix used as the drift baseline.
+
+    `edges[i]` holds the interior bin edges of column `i` (deduplicated, so heavily tied
+    columns get fewer bins) and `fractions[i]` the reference share of rows per bin.
+    Batch shares are smoothed with `PSI_PSEUDO_COUNT` per bin, and `p_values` gives a
+    chi-square goodness-of-fit test so callers can tell real drift from sampling noise.
+    """
+
+    columns: list[str]
+    edges: list[np.ndarray]
+    fractions: list[np.ndarray]
+
+    @classmethod
+    def from_matrix(
+        cls, matrix: np.ndarray, columns: list[str], bins: int = 10
+    ) -> DriftReference:
+        quantiles = np.linspace(0.0, 1.0, bins + 1)[1:-1]
+        edges: list[np.ndarray] = []
+        fractions: list[np.ndarray] = []
+        for column in range(matrix.shape[1]):
+            values = np.asarray(matrix[:, column], dtype=float)
+            inner = np.unique(np.quantile(values, quantiles)) if len(values) else np.array([])
+            edges.append(inner)
+            counts = _bin_counts(values, inner)
+            total = counts.sum()
+            fractions.append(np.clip(counts / total if total else counts, PSI_EPSILON, None))
+        return cls(columns=list(columns), edges=edges, fractions=fractions)
+
+    def psi(self, matrix: np.ndarray) -> dict[str, float]:
+        """Return the population stability index of each column of `matrix`."""
+
+        result: dict[str, float] = {}
+        for column, name in enumerate(self.columns):
+            expected = self.fractions[column]
+            counts = _bin_counts(np.asarray(matrix[:, column], dtype=float), self.edges[column])
+            actual = (counts + PSI_PSEUDO_COUNT) / (counts.sum() + PSI_PSEUDO_COUNT * len(counts))
+            result[name] = float(np.sum((actual - expected) * np.log(actual / expected)))
+        LOGGER.info("drift.psi", extra={"extra_data": {"rows": len(matrix), **result}})
+        return result
+
+    def p_values(self, matrix: np.ndarray) -> dict[str, float]:
+        """Return the chi-square p-value of each column's bin counts against the reference."""
+
+        result: dict[str, float] = {}
+        for column, name in enumerate(self.columns):
+            counts = _bin_counts(np.asarray(matrix[:, column], dtype=float), self.edges[column])
+            if len(counts) < 2 or counts.sum() == 0:
+                result[name] = 1.0
+                continue
+            expected = counts.sum() * self.fractions[column] / self.fractions[column].sum()
+            statistic = float(np.sum((counts - expected) ** 2 / expected))
+            result[name] = float(chi2.sf(statistic, len(counts) - 1))
+        return result
+
+
+def _bin_counts(values: np.ndarray, inner_edges: np.ndarray) -> np.ndarray:
+    return np.bincount(
+        np.searchsorted(inner_edges, values, side="right"), minlength=len(inner_edges) + 1
+    ).astype(float)
@@ -0,0 +1,193 @@
+"""Memory-mapped cache of the anomaly feature matrix."""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from .anomaly import FEATURE_COLUMNS, feature_matrix
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _write_text_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as stream:
+            stream.write(text)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def read_rows(
+    source: str | Path, indices: np.ndarray, columns: list[str] | None = None
+) -> pd.DataFrame:
+    """Decode only the row groups of a Parquet file that hold `indices`, in `indices` order."""
+
+    parquet = pq.ParquetFile(source)
+    metadata = parquet.metadata
+    sizes = [metadata.row_group(group).num_rows for group in range(metadata.num_row_groups)]
+    starts = np.cumsum([0] + sizes)
+    indices = np.asarray(indices, dtype=np.int64)
+    owners = np.searchsorted(starts, indices, side="right") - 1
+    groups, position = np.unique(owners, return_inverse=True)
+    table = parquet.read_row_groups(groups.tolist(), columns=columns)
+    # Offset of each decoded group inside the concatenated table.
+    offsets = np.cumsum(np.concatenate([[0], np.diff(starts)[groups][:-1]]))
+    return table.take(offsets[position] + indices - starts[owners]).to_pandas()
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    """Package version plus a digest of the package sources, so local edits bust the cache."""
+
+    try:
+        version = metadata.version("hei-seti")
+    except metadata.PackageNotFoundError:  # pragma: no cover - during development
+        version = "0.0.0"
+    digest = hashlib.sha256(version.encode("utf-8"))
+    for source in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(source.name.encode("utf-8"))
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def file_digest(path: str | Path, chunk_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file, read in fixed-size chunks."""
+
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as stream:
+        for chunk in iter(lambda: stream.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stat_digest(path: str | Path, memo_dir: str | Path) -> str:
+    """Return `file_digest(path)`, remembered in `memo_dir` per (path, size, mtime_ns).
+
+    An unchanged file is never re-read; a pointer file keyed by its stat maps straight to
+    the digest, and is touched on each hit so size-bounded caches can evict it by age.
+    """
+
+    path = Path(path).resolve()
+    stat = path.stat()
+    stat_key = hashlib.sha256(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}".encode()).hexdigest()
+    pointer = Path(memo_dir) / f"{stat_key}.txt"
+    if pointer.exists():
+        os.utime(pointer)
+        return pointer.read_text(encoding="utf-8").strip()
+    digest = file_digest(path)
+    _write_text_atomic(pointer, digest)
+    return digest
+
+
+@dataclass(slots=True)
+class FeatureCache:
+    """Materialise `FEATURE_COLUMNS` once per source file as a read-only `.npy` memmap.
+
+    Entries are keyed by the content digest of the source Parquet file together with
+    `FEATURE_COLUMNS` and `code_version()`, so a change to the features, the column list
+    or the transform invalidates the cache. The digest is remembered per (path, size,
+    mtime_ns), so an unchanged source is not re-read on a hit; the file is only hashed
+    again after it is rewritten. Loaded matrices are opened with `mmap_mode="r"`, which
+    lets concurrent processes share the same page-cache pages instead of copying. When
+    `max_bytes` is set the least recently used matrices and pointer files are evicted
+    after each load.
+    """
+
+    directory: str | Path = "data/cache/features"
+    max_bytes: int | None = None
+
+    def digest_for(self, source: str | Path) -> str:
+        """Return the content digest of `source`, hashing it only when its stat changed."""
+
+        return stat_digest(source, Path(self.directory) / "stat")
+
+    def path_for(self, source: str | Path) -> Path:
+        payload = {
+            "source": self.digest_for(source),
+            "columns": list(FEATURE_COLUMNS),
+            "code": code_version(),
+        }
+        key = hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+        return Path(self.directory) / f"{key}.npy"
+
+    def load(self, source: str | Path) -> np.ndarray:
+        """Return the prepared feature matrix for `source`, building it on a cache miss."""
+
+        path = self.path_for(source)
+        if path.exists():
+            os.utime(path)
+            LOGGER.info(
+                "feature_cache.hit",
+                extra={"extra_data": {"source": str(source), "path": str(path)}},
+            )
+        else:
+            self._materialize(source, path)
+        matrix = np.load(path, mmap_mode="r")
+        if self.max_bytes is not None:
+            # The open memmap keeps the pages readable even if this entry is evicted.
+            self.gc()
+        return matrix
+
+    def gc(self, max_bytes: int | None = None) -> list[Path]:
+        """Evict least recently used matrices and pointer files beyond `max_bytes`."""
+
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        if limit is None:
+            return []
+        directory = Path(self.directory)
+        files = [*directory.glob("*.npy"), *directory.glob("stat/*.txt")]
+        stats = sorted(
+            ((path.stat(), path) for path in files), key=lambda item: item[0].st_mtime_ns
+        )
+        total = sum(stat.st_size for stat, _ in stats)
+        evicted = []
+        for stat, path in stats:
+            if total <= limit:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+            evicted.append(path)
+        LOGGER.info(
+            "feature_cache.gc",
+            extra={"extra_data": {"evicted": len(evicted), "bytes": total, "limit": limit}},
+        )
+        return evicted
+
+    def _materialize(self, source: str | Path, path: Path) -> None:
+        table = pq.read_table(source, columns=FEATURE_COLUMNS)
+        matrix = np.ascontiguousarray(feature_matrix(table.to_pandas()))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file and rename so readers never observe a partial matrix.
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".npy.tmp")
+        try:
+            with os.fdopen(fd, "wb") as stream:
+                np.save(stream, matrix)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        LOGGER.info(
+            "feature_cache.materialize",
+            extra={
+                "extra_data": {
+                    "source": str(source),
+                    "path": str(path),
+                    "rows": int(matrix.shape[0]),
+                }
+            },
+        )
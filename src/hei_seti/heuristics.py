@@ -3,7 +3,8 @@ from __future__ import annotations
 
 import logging
 import math
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Mapping
 
 import numpy as np
 import pandas as pd
@@ -16,12 +17,50 @@ ERG_CM2_S_TO_W_M2 = 1e-3  # Rough conversion factor for flux units
 KPC_TO_METERS = 3.0856775814913673e19
 
 
+@dataclass(slots=True)
+class BarrowThresholds:
+    """Cut points of the Barrow level rules applied by `KBarrowCalculator.barrow`."""
+
+    mass_bv: float = 10.0
+    variability_bv: float = 100.0
+    hardness_biv: float = 5.0
+    mass_bomega: float = 20.0
+    variability_bomega: float = 200.0
+
+
+BARROW_THRESHOLD_FIELDS = tuple(BarrowThresholds.__dataclass_fields__)
+
+
+def barrow_levels(columns: Mapping[str, np.ndarray], thresholds: BarrowThresholds) -> np.ndarray:
+    """Vectorised Barrow rules over `bh_mass`, `var_ratio` and `hardness` arrays.
+
+    Threshold fields may themselves be arrays (e.g. shape `(sets, 1)` against `(rows,)`
+    feature arrays) to evaluate many threshold sets in one broadcast. Missing or NaN
+    features never satisfy a rule, as in the row-wise `KBarrowCalculator.barrow`.
+    """
+
+    mass = np.asarray(columns.get("bh_mass", np.nan), dtype=float)
+    variability = np.asarray(columns.get("var_ratio", np.nan), dtype=float)
+    hardness = np.asarray(columns.get("hardness", np.nan), dtype=float)
+    shape = np.broadcast_shapes(
+        mass.shape, variability.shape, hardness.shape, np.shape(thresholds.mass_bv)
+    )
+    level = np.full(shape, int(BarrowLevel.BIII), dtype=np.int8)
+    bv = (mass >= thresholds.mass_bv) | (variability > thresholds.variability_bv)
+    level[np.broadcast_to(bv, shape)] = BarrowLevel.BV
+    level[np.broadcast_to(hardness > thresholds.hardness_biv, shape)] = BarrowLevel.BIV
+    omega = (mass >= thresholds.mass_bomega) & (variability > thresholds.variability_bomega)
+    level[np.broadcast_to(omega, shape)] = BarrowLevel.BOMEGA
+    return level
+
+
 @dataclass(slots=True)
 class KBarrowCalculator:
     """Compute Kardashev and Barrow proxies from engineered features."""
 
     distance_col: str | None = None
     flux_unit: str = "erg cm-2 s-1"
+    thresholds: BarrowThresholds = field(default_factory=BarrowThresholds)
 
     def estimate_power_watts(self, row: pd.Series) -> float:
         """Estimate power output using flux and optional distance."""
@@ -41,6 +80,20 @@ class KBarrowCalculator:
             power = flux_wm2 * 1e20  # fallback scale factor when distance unknown
         return power
 
+    def power_watts_array(
+        self, flux: np.ndarray, distance_kpc: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Vectorised `estimate_power_watts` over arrays of any (broadcastable) shape."""
+
+        flux_wm2 = np.asarray(flux, dtype=float)
+        if self.flux_unit.lower().startswith("erg"):
+            flux_wm2 = flux_wm2 * ERG_CM2_S_TO_W_M2
+        fallback = flux_wm2 * 1e20  # fallback scale factor when distance unknown
+        if distance_kpc is None:
+            return fallback
+        distance_m = np.asarray(distance_kpc, dtype=float) * KPC_TO_METERS * 1e3
+        return np.where(np.isnan(distance_m), fallback, 4 * np.pi * distance_m**2 * flux_wm2)
+
     def kardashev(self, row: pd.Series) -> float:
         power = self.estimate_power_watts(row)
         rating = KardashevRating(power).value()
@@ -52,14 +105,20 @@ class KBarrowCalculator:
         variability = row.get("var_ratio")
         hardness = row.get("hardness")
 
+        limits = self.thresholds
         level = BarrowLevel.BIII
-        if pd.notna(mass) and float(mass) >= 10:
+        if pd.notna(mass) and float(mass) >= limits.mass_bv:
             level = BarrowLevel.BV
-        if pd.notna(variability) and float(variability) > 100:
+        if pd.notna(variability) and float(variability) > limits.variability_bv:
             level = BarrowLevel.BV
-        if pd.notna(hardness) and float(hardness) > 5:
+        if pd.notna(hardness) and float(hardness) > limits.hardness_biv:
             level = BarrowLevel.BIV
-        if pd.notna(mass) and float(mass) >= 20 and pd.notna(variability) and float(variability) > 200:
+        if (
+            pd.notna(mass)
+            and float(mass) >= limits.mass_bomega
+            and pd.notna(variability)
+            and float(variability) > limits.variability_bomega
+        ):
             level = BarrowLevel.BOMEGA
 
         LOGGER.debug(
@@ -80,7 +139,12 @@ class KBarrowCalculator:
 
         result = df.copy()
         result["K"] = df.apply(self.kardashev, axis=1)
-        result["B"] = df.apply(self.barrow, axis=1)
+        columns = {
+            name: pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=float)
+            for name in ("bh_mass", "var_ratio", "hardness")
+            if name in df
+        }
+        result["B"] = barrow_levels(columns, self.thresholds).astype(np.int64)
         LOGGER.info(
             "heuristics.annotate",
             extra={
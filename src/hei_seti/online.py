@@ -0,0 +1,116 @@
+"""Incremental scoring of newly ingested sources against a saved model."""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from .anomaly import AnomalyModel
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class OnlineUpdate:
+    """Outcome of merging a batch of new sources into the candidate list."""
+
+    candidates: pd.DataFrame
+    scored: pd.DataFrame
+    drift: dict[str, float]
+    drifted: list[str]
+    p_values: dict[str, float] = field(default_factory=dict)
+    insufficient: bool = False
+
+    @property
+    def retrain(self) -> bool:
+        """Whether any feature drifted significantly, warranting a full retrain.
+
+        Always False when the batch was too small (`insufficient`) for a drift check.
+        """
+
+        return bool(self.drifted)
+
+
+def merge_candidates(existing: pd.DataFrame, new: pd.DataFrame, top: int) -> pd.DataFrame:
+    """Merge freshly scored rows into an existing top-K list.
+
+    A source already present (matched on `name`) is replaced by its new score, and anything
+    new that beats the current K-th score displaces it. Rows outside the previous top-K are
+    not kept, so this is approximate: when an existing candidate is rescored lower, the
+    row that should move up in its place is unknown, and the list can miss it until the
+    next full `score`.
+    """
+
+    combined = pd.concat([existing, new], ignore_index=True)
+    if "name" in combined:
+        combined = combined.drop_duplicates(subset=["name"], keep="last")
+    merged = combined.sort_values("anomaly", ascending=False, kind="stable").head(top)
+    merged = merged.reset_index(drop=True)
+    merged["rank"] = range(1, len(merged) + 1)
+    return merged
+
+
+@dataclass(slots=True)
+class OnlineScorer:
+    """Score new feature rows, check for drift, and fold them into the candidate list.
+
+    A feature counts as drifted when its PSI exceeds `drift_threshold` and its chi-square
+    p-value is below `significance` (Bonferroni-corrected across features), so sampling
+    noise in small batches does not trigger a retrain. Batches under `min_rows` rows are
+    reported as insufficient for a drift check.
+    """
+
+    model: AnomalyModel
+    top: int = 50
+    drift_threshold: float = 0.25
+    min_rows: int = 50
+    significance: float = 0.01
+
+    def update(self, features: pd.DataFrame, existing: pd.DataFrame | None) -> OnlineUpdate:
+        scored = features.copy()
+        if self.model.is_ensemble:
+            for column, values in self.model.score_ensemble(features).items():
+                scored[column] = values.to_numpy()
+        else:
+            scored["anomaly"] = self.model.score(features).to_numpy()
+        drift = self.model.drift(features)
+        insufficient = len(features) < self.min_rows
+        drifted: list[str] = []
+        p_values: dict[str, float] = {}
+        if not insufficient and drift:
+            p_values = self.model.drift_p_values(features)
+            alpha = self.significance / len(drift)
+            drifted = sorted(
+                column
+                for column, psi in drift.items()
+                if psi > self.drift_threshold and p_values[column] < alpha
+            )
+        if existing is None:
+            existing = scored.iloc[0:0]
+        candidates = merge_candidates(existing, scored, self.top)
+        LOGGER.info(
+            "online.update",
+            extra={
+                "extra_data": {
+                    "rows": len(features),
+                    "candidates": len(candidates),
+                    "drifted": drifted,
+                    "insufficient": insufficient,
+                    "retrain": bool(drifted),
+                }
+            },
+        )
+        if drifted:
+            LOGGER.warning(
+                "online.drift",
+                extra={"extra_data": {"columns": drifted, "threshold": self.drift_threshold}},
+            )
+        return OnlineUpdate(
+            candidates=candidates,
+            scored=scored,
+            drift=drift,
+            drifted=drifted,
+            p_values=p_values,
+            insufficient=insufficient,
+        )
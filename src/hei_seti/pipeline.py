@@ -1,23 +1,50 @@
 """End-to-end orchestration for the HEI-SETI workflow."""
 from __future__ import annotations
 
+import json
 import logging
+import uuid
 from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Callable, Iterable
 
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 import yaml
 from joblib import dump, load
 
-from .anomaly import AnomalyModel
+from .anomaly import FEATURE_COLUMNS, AnomalyModel, feature_matrix
+from .barrow_sweep import BARROW_INPUTS, BarrowSweep
+from .crossmatch import CrossMatcher
 from .data_sources import HeasarcFetcher
+from .distributed import (
+    BROKERS,
+    TaskBroker,
+    Worker,
+    collect_outputs,
+    default_payloads,
+    split_parquet,
+    write_atomic,
+)
+from .feature_cache import FeatureCache, file_digest, read_rows
 from .features import FeatureBuilder
-from .heuristics import KBarrowCalculator
+from .heuristics import BarrowThresholds, KBarrowCalculator
+from .lightcurves import LightCurveFeatures, join_lightcurve_features, lightcurve_files
 from .logging_conf import setup_logging
+from .online import OnlineScorer, OnlineUpdate
+from .profiling import ALL_TABLES, DEFAULT_QUANTILES, Profiler
+from .similarity import SimilarityIndex
+from .stage_cache import StageCache, stage_key
+from .store import ResultsStore
+from .sweep import SweepRunner
+from .uncertainty import KardashevUncertainty
 
 LOGGER = logging.getLogger(__name__)
 
+STORE_KEY_COLUMNS = ["name", "_source_table", "K", "B"]
+
 
 @dataclass(slots=True)
 class Pipeline:
@@ -35,13 +62,160 @@ class Pipeline:
         LOGGER.info("pipeline.init", extra={"extra_data": {"config": str(path)}})
         return cls(config=config)
 
-    def fetch(self, tables: Iterable[str] | None = None, output: str | Path = "data/raw.parquet") -> pd.DataFrame:
+    def _feature_cache(self) -> FeatureCache | None:
+        cfg = self.config.get("cache", {})
+        directory = cfg.get("features_dir")
+        if not directory:
+            return None
+        return FeatureCache(directory, max_bytes=cfg.get("features_max_bytes"))
+
+    def _feature_matrix(self, input_path: str | Path) -> np.ndarray:
+        cache = self._feature_cache()
+        if cache is not None:
+            return cache.load(input_path)
+        return feature_matrix(pd.read_parquet(input_path, columns=FEATURE_COLUMNS))
+
+    def stage_cache(self) -> StageCache | None:
+        cfg = self.config.get("stage_cache", {})
+        directory = cfg.get("dir")
+        return StageCache(directory, max_bytes=cfg.get("max_bytes")) if directory else None
+
+    def results_store(self) -> ResultsStore | None:
+        cfg = self.config.get("store", {})
+        path = cfg.get("path")
+        return ResultsStore(path, batch_size=cfg.get("batch_size", 50000)) if path else None
+
+    def query(
+        self,
+        table: str = "scores",
+        filters: Iterable[str] = (),
+        order: str | None = None,
+        limit: int | None = 50,
+        offset: int = 0,
+        run_id: str | None = None,
+    ) -> pd.DataFrame:
+        """Filter and paginate stored features or scores without loading whole runs."""
+
+        store = self.results_store()
+        if store is None:
+            raise ValueError("The results store is disabled (set store.path in the config)")
+        return store.query(
+            table, filters=filters, order=order, limit=limit, offset=offset, run_id=run_id
+        )
+
+    def _cached_stage(
+        self,
+        stage: str,
+        *,
+        inputs: Iterable[str | Path],
+        sections: Iterable[str],
+        outputs: list[str | Path],
+        run: Callable[[], Any],
+        load: Callable[[], Any],
+        extra: dict[str, Any] | None = None,
+        refresh: bool = False,
+    ) -> Any:
+        """Run a stage, or restore its outputs when inputs, config and code are unchanged.
+
+        `refresh` always reruns the stage and replaces its cache entry.
+        """
+
+        cache = self.stage_cache()
+        if cache is None:
+            return run()
+        config = {section: self.config.get(section, {}) for section in sections}
+        key = cache.key(stage, inputs, config, extra)
+        if not refresh and cache.restore(stage, key, outputs):
+            return load()
+        result = run()
+        cache.store(stage, key, outputs)
+        return result
+
+    def _run_key(
+        self,
+        stage: str,
+        inputs: Iterable[str | Path],
+        sections: Iterable[str] = (),
+        extra: dict[str, Any] | None = None,
+    ) -> str:
+        """Content key of a stage run, hashed with the stage cache's digest memo when enabled."""
+
+        config = {section: self.config.get(section, {}) for section in sections}
+        cache = self.stage_cache()
+        if cache is not None:
+            return cache.key(stage, inputs, config, extra)
+        return stage_key(stage, [file_digest(path) for path in inputs], config, extra)
+
+    def fetch(
+        self,
+        tables: Iterable[str] | None = None,
+        output: str | Path = "data/raw.parquet",
+        refresh: bool = False,
+    ) -> pd.DataFrame:
+        """Fetch catalogue tables; `refresh` bypasses the stage cache to pull updates."""
+
         cfg = self.config.get("fetch", {})
         tables = list(tables or cfg.get("heasarc_tables", []))
-        fetcher = HeasarcFetcher(maxrec=cfg.get("maxrec", 20000))
-        dataframe = fetcher.fetch_many(tables)
-        fetcher.persist_dataframe(dataframe, output)
-        return dataframe
+
+        def run() -> pd.DataFrame:
+            fetcher = HeasarcFetcher(maxrec=cfg.get("maxrec", 20000))
+            dataframe = fetcher.fetch_many(tables)
+            fetcher.persist_dataframe(dataframe, output)
+            return dataframe
+
+        return self._cached_stage(
+            "fetch",
+            inputs=[],
+            sections=("fetch",),
+            outputs=[output],
+            run=run,
+            load=lambda: pd.read_parquet(output),
+            extra={"tables": tables},
+            refresh=refresh,
+        )
+
+    def crossmatch(
+        self,
+        dataframe: pd.DataFrame | None = None,
+        input_path: str | Path = "data/raw.parquet",
+        output: str | Path = "data/matched.parquet",
+    ) -> pd.DataFrame:
+        """Merge positional counterparts across fetched catalogues before featurizing."""
+
+        def run() -> pd.DataFrame:
+            raw = dataframe if dataframe is not None else pd.read_parquet(input_path)
+            cfg = self.config.get("crossmatch", {})
+            matcher = CrossMatcher(
+                radius_arcsec=cfg.get("radius_arcsec", 5.0),
+                ra_cols=cfg.get("ra_cols", ["ra"]),
+                dec_cols=cfg.get("dec_cols", ["dec"]),
+                match_within_tables=cfg.get("match_within_tables", False),
+            )
+            merged = matcher.merge(raw)
+            Path(output).parent.mkdir(parents=True, exist_ok=True)
+            merged.to_parquet(output)
+            LOGGER.info(
+                "pipeline.crossmatch",
+                extra={
+                    "extra_data": {
+                        "rows": len(raw),
+                        "merged_rows": len(merged),
+                        "output": str(output),
+                    }
+                },
+            )
+            return merged
+
+        if dataframe is not None:
+            return run()
+        return self._cached_stage(
+            "crossmatch",
+            inputs=[input_path],
+            sections=("crossmatch",),
+            outputs=[output],
+            run=run,
+            load=lambda: pd.read_parquet(output),
+        )
 
     def featurize(
         self,
@@ -49,8 +223,145 @@ class Pipeline:
         input_path: str | Path = "data/raw.parquet",
         output: str | Path = "data/features.parquet",
     ) -> pd.DataFrame:
-        if dataframe is None:
-            dataframe = pd.read_parquet(input_path)
+        def run() -> pd.DataFrame:
+            raw = dataframe if dataframe is not None else pd.read_parquet(input_path)
+            features = self.build_features(raw)
+            Path(output).parent.mkdir(parents=True, exist_ok=True)
+            features.to_parquet(output)
+            LOGGER.info(
+                "pipeline.featurize",
+                extra={"extra_data": {"rows": len(features), "output": str(output)}},
+            )
+            return features
+
+        lightcurves = self._lightcurve_table()
+        inputs = [input_path] + ([lightcurves] if lightcurves is not None else [])
+        sections = ("features", "heuristics")
+        if dataframe is not None:
+            features = run()
+        else:
+            features = self._cached_stage(
+                "featurize",
+                inputs=inputs,
+                sections=sections,
+                outputs=[output],
+                run=run,
+                load=lambda: pd.read_parquet(output),
+            )
+        # Outside the cached stage, so a cache hit still records this run in the store; the
+        # run key makes the store skip a run it already holds.
+        store = self.results_store()
+        if store is not None:
+            if dataframe is None:
+                run_key = self._run_key("featurize", inputs, sections)
+                store.write_features(features, input_path, run_key=run_key)
+            else:
+                store.write_features(features)
+        return features
+
+    def _lightcurve_table(self) -> Path | None:
+        """Return the light-curve feature table to join, or None unless `enabled` is set."""
+
+        cfg = self.config.get("lightcurves", {})
+        if not cfg.get("enabled", False):
+            return None
+        output = Path(cfg.get("output", "data/lightcurve_features.parquet"))
+        if not output.exists():
+            raise FileNotFoundError(
+                f"lightcurves.enabled is set but {output} does not exist;"
+                " run `hei-seti lightcurves` first"
+            )
+        return output
+
+    def lightcurves(
+        self,
+        directory: str | Path | None = None,
+        output: str | Path | None = None,
+        n_jobs: int | None = None,
+    ) -> pd.DataFrame:
+        """Extract `lc_*` features from a light-curve directory for `featurize` to join."""
+
+        cfg = self.config.get("lightcurves", {})
+        directory = directory or cfg.get("dir", "data/lightcurves")
+        output = output or cfg.get("output", "data/lightcurve_features.parquet")
+        extractor = LightCurveFeatures(
+            time_col=cfg.get("time_col", "time"),
+            flux_col=cfg.get("flux_col", "flux"),
+            flux_err_col=cfg.get("flux_err_col", "flux_err"),
+            batch_size=cfg.get("batch_size", 65536),
+            max_points=cfg.get("max_points", 2000),
+            max_frequencies=cfg.get("max_frequencies", 5000),
+            samples_per_peak=cfg.get("samples_per_peak", 5.0),
+            min_period=cfg.get("min_period"),
+            max_period=cfg.get("max_period"),
+            n_jobs=n_jobs if n_jobs is not None else cfg.get("n_jobs", -1),
+        )
+        table = extractor.extract(lightcurve_files(directory))
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        table.to_parquet(output)
+        LOGGER.info(
+            "pipeline.lightcurves",
+            extra={"extra_data": {"sources": len(table), "output": str(output)}},
+        )
+        return table
+
+    def profile(
+        self,
+        input_path: str | Path = "data/raw.parquet",
+        output: str | Path | None = None,
+        n_jobs: int | None = None,
+    ) -> dict:
+        """Write a JSON data-quality report for a catalogue or feature table in one pass."""
+
+        cfg = self.config.get("profile", {})
+        feature_cfg = self.config.get("features", {})
+        profiler = Profiler(
+            feature_sources={
+                "flux": feature_cfg.get("flux_cols", []),
+                "hardness": feature_cfg.get("hardness_cols", []),
+                "period": feature_cfg.get("period_cols", []),
+                "bh_mass": feature_cfg.get("bh_mass_cols", []),
+            },
+            relative_accuracy=cfg.get("relative_accuracy", 0.01),
+        )
+        batch_size = cfg.get("batch_size", 65536)
+        profile = profiler.run(
+            input_path,
+            batch_size=batch_size,
+            n_jobs=n_jobs if n_jobs is not None else cfg.get("n_jobs", 1),
+        )
+        run_id = uuid.uuid4().hex
+        report = {
+            "run_id": run_id,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "input": str(input_path),
+            "relative_accuracy": profiler.relative_accuracy,
+            "tables": profile.report(cfg.get("quantiles", DEFAULT_QUANTILES)),
+        }
+        output = Path(output or Path(cfg.get("dir", "results/profiles")) / f"profile-{run_id}.json")
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        report["output"] = str(output)
+        LOGGER.info(
+            "pipeline.profile",
+            extra={
+                "extra_data": {
+                    "run_id": run_id,
+                    "rows": report["tables"].get(ALL_TABLES, {}).get("rows", 0),
+                    "output": str(output),
+                }
+            },
+        )
+        return report
+
+    def build_features(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """Run `FeatureBuilder` and `KBarrowCalculator` over raw rows without persisting.
+
+        The output schema is the derived features, `heuristics.distance_col` as a float
+        column when the raw rows hold it (so K uses the distance), `K`, `B`, `name` and
+        `_source_table`.
+        """
+
         cfg = self.config.get("features", {})
         builder = FeatureBuilder(
             flux_cols=cfg.get("flux_cols", []),
@@ -59,21 +370,74 @@ class Pipeline:
             bh_mass_cols=cfg.get("bh_mass_cols", []),
         )
         features = builder.transform(dataframe)
+        calculator = self._kb_calculator()
+        distance_col = calculator.distance_col
+        if distance_col and distance_col in dataframe:
+            # Carried through so `annotate` (and `uncertainty`) compute K with the distance.
+            features[distance_col] = pd.to_numeric(dataframe[distance_col], errors="coerce")
+        names = dataframe.get("name", dataframe.get("src_name", dataframe.index))
+        lightcurves = self._lightcurve_table()
+        if lightcurves is not None:
+            # Before annotate, so light-curve var_ratio and period feed the Barrow rules.
+            lc_table = pd.read_parquet(lightcurves)
+            features = join_lightcurve_features(features, lc_table, pd.Series(names).to_numpy())
+        features = calculator.annotate(features)
+        features["name"] = names
+        features["_source_table"] = dataframe.get("_source_table", "unknown")
+        return features
+
+    def _kb_calculator(self) -> KBarrowCalculator:
         heur_cfg = self.config.get("heuristics", {})
-        kb = KBarrowCalculator(
+        return KBarrowCalculator(
             distance_col=heur_cfg.get("distance_col"),
             flux_unit=heur_cfg.get("flux_unit", "erg cm-2 s-1"),
+            thresholds=BarrowThresholds(**heur_cfg.get("barrow_thresholds", {})),
         )
-        features = kb.annotate(features)
-        features["name"] = dataframe.get("name", dataframe.get("src_name", dataframe.index))
-        features["_source_table"] = dataframe.get("_source_table", "unknown")
-        Path(output).parent.mkdir(parents=True, exist_ok=True)
-        features.to_parquet(output)
+
+    def uncertainty(
+        self,
+        dataframe: pd.DataFrame | None = None,
+        input_path: str | Path = "data/raw.parquet",
+        output: str | Path | None = "results/kardashev_uncertainty.parquet",
+    ) -> pd.DataFrame:
+        """Monte Carlo K distribution per source from flux and distance uncertainties.
+
+        `K` is the same point estimate `featurize` writes. For sources without a distance it
+        uses the calculator's fixed fallback scale, while the samples draw a distance from
+        `distance_prior_kpc`; such rows are marked `distance_from_prior`.
+        """
+
+        raw = dataframe if dataframe is not None else pd.read_parquet(input_path)
+        cfg = self.config.get("uncertainty", {})
+        calculator = self._kb_calculator()
+        propagator = KardashevUncertainty(
+            calculator=calculator,
+            n_samples=cfg.get("n_samples", 1000),
+            chunk_size=cfg.get("chunk_size", 2048),
+            flux_err_col=cfg.get("flux_err_col", "flux_err"),
+            distance_err_col=cfg.get("distance_err_col", "distance_err_kpc"),
+            flux_rel_err=cfg.get("flux_rel_err", 0.1),
+            distance_rel_err=cfg.get("distance_rel_err", 0.3),
+            distance_prior_kpc=tuple(cfg.get("distance_prior_kpc") or ()) or None,
+            percentiles=tuple(cfg.get("percentiles", (16, 50, 84))),
+            seed=cfg.get("seed", 0),
+        )
+        # build_features carries the distance column; carry the error columns across too.
+        features = self.build_features(raw)
+        for column in (propagator.flux_err_col, propagator.distance_err_col):
+            if column and column in raw:
+                features[column] = raw[column].to_numpy()
+        summary = propagator.summarize(features)
+        result = pd.concat([features[["name", "_source_table", "K"]], summary], axis=1)
+        if output is not None:
+            output_path = Path(output)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            result.to_parquet(output_path)
         LOGGER.info(
-            "pipeline.featurize",
-            extra={"extra_data": {"rows": len(features), "output": str(output)}},
+            "pipeline.uncertainty",
+            extra={"extra_data": {"rows": len(result), "output": str(output)}},
         )
-        return features
+        return result
 
     def train(
         self,
@@ -81,22 +445,52 @@ class Pipeline:
         input_path: str | Path = "data/features.parquet",
         model_path: str | Path = "models/iforest.joblib",
     ) -> Path:
-        if features is None:
-            features = pd.read_parquet(input_path)
-        cfg = self.config.get("anomaly", {})
-        model = AnomalyModel(
-            contamination=cfg.get("contamination", 0.05),
-            random_state=cfg.get("random_state"),
-        )
-        model.fit(features)
         model_path = Path(model_path)
-        model_path.parent.mkdir(parents=True, exist_ok=True)
-        dump(model, model_path)
-        LOGGER.info(
-            "pipeline.train",
-            extra={"extra_data": {"rows": len(features), "model_path": str(model_path)}},
+        sim_cfg = self.config.get("similarity", {})
+
+        def run() -> Path:
+            cache = self._feature_cache()
+            data = features
+            if data is None:
+                data = cache.load(input_path) if cache else pd.read_parquet(input_path)
+            cfg = self.config.get("anomaly", {})
+            model = AnomalyModel(
+                contamination=cfg.get("contamination", 0.05),
+                random_state=cfg.get("random_state"),
+                n_estimators=cfg.get("n_estimators", 100),
+                max_samples=cfg.get("max_samples", "auto"),
+                ensemble_size=cfg.get("ensemble_size", 1),
+                n_jobs=cfg.get("n_jobs"),
+            )
+            model.fit(data)
+            model_path.parent.mkdir(parents=True, exist_ok=True)
+            dump(model, model_path)
+            if sim_cfg.get("enabled", False):
+                if isinstance(data, pd.DataFrame):
+                    matrix, names = feature_matrix(data), data["name"]
+                else:
+                    matrix, names = data, pd.read_parquet(input_path, columns=["name"])["name"]
+                index = SimilarityIndex.build(matrix, names, leafsize=sim_cfg.get("leafsize", 32))
+                index.save(SimilarityIndex.path_for(model_path))
+            LOGGER.info(
+                "pipeline.train",
+                extra={"extra_data": {"rows": len(data), "model_path": str(model_path)}},
+            )
+            return model_path
+
+        if features is not None:
+            return run()
+        outputs: list[str | Path] = [model_path]
+        if sim_cfg.get("enabled", False):
+            outputs.append(SimilarityIndex.path_for(model_path))
+        return self._cached_stage(
+            "train",
+            inputs=[input_path],
+            sections=("anomaly", "similarity"),
+            outputs=outputs,
+            run=run,
+            load=lambda: model_path,
         )
-        return model_path
 
     def score(
         self,
@@ -106,22 +500,342 @@ class Pipeline:
         top: int = 50,
         output: str | Path | None = "results/candidates.csv",
     ) -> pd.DataFrame:
+        store = self.results_store()
+        run_key = None
+        if store is not None and features is None:
+            # Every row's scores depend only on the input, the model and the code.
+            run_key = self._run_key("score", [model_path, input_path])
+        record = store is not None and (
+            run_key is None or store.find_run("scores", run_key) is None
+        )
+
+        def run() -> tuple[pd.DataFrame, pd.DataFrame | None]:
+            model: AnomalyModel = load(model_path)
+            cache = self._feature_cache()
+            data = None
+            if features is None and cache is not None:
+                scores, all_scores = self._rank_cached(model, cache, input_path, top)
+            else:
+                data = features if features is not None else pd.read_parquet(input_path)
+                if model.is_ensemble:
+                    all_scores = model.score_ensemble(data)
+                else:
+                    all_scores = model.score(data).to_numpy()
+                scores = model.rank(data, top=top, scores=all_scores)
+            rows = len(all_scores)
+            stored = None
+            if record:
+                if data is None:
+                    data = pd.read_parquet(input_path, columns=STORE_KEY_COLUMNS)
+                stored = data.reindex(columns=STORE_KEY_COLUMNS).reset_index(drop=True)
+                if isinstance(all_scores, pd.DataFrame):
+                    stored = pd.concat([stored, all_scores.reset_index(drop=True)], axis=1)
+                else:
+                    stored["anomaly"] = all_scores
+            if output is not None:
+                output_path = Path(output)
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                scores.to_csv(output_path, index=False)
+                LOGGER.info(
+                    "pipeline.score",
+                    extra={
+                        "extra_data": {
+                            "rows": rows,
+                            "top": top,
+                            "output": str(output_path),
+                        }
+                    },
+                )
+            return scores, stored
+
+        if features is not None or output is None:
+            scores, stored = run()
+        else:
+            # The model artifact already captures every training setting, so no `anomaly:`
+            # section here: retuning training alone must not invalidate cached scores. Only
+            # the top rows are cached, so a run the store lacks is scored afresh to record
+            # every row.
+            scores, stored = self._cached_stage(
+                "score",
+                inputs=[model_path, input_path],
+                sections=(),
+                outputs=[output],
+                run=run,
+                load=lambda: (pd.read_csv(output), None),
+                extra={"top": top},
+                refresh=record,
+            )
+        if record:
+            store.write_scores(
+                stored,
+                model_id=file_digest(model_path),
+                input_path=input_path if features is None else None,
+                metadata={"top": top},
+                run_key=run_key,
+            )
+        return scores
+
+    def neighbors(
+        self,
+        model_path: str | Path,
+        names: Iterable[str] | None = None,
+        candidates: str | Path | None = None,
+        k: int = 10,
+    ) -> pd.DataFrame:
+        """Return the k nearest catalogue systems for named sources or a candidate list."""
+
+        index = SimilarityIndex.load(SimilarityIndex.path_for(model_path))
+        queries = list(names or [])
+        if candidates is not None:
+            queries.extend(pd.read_csv(candidates, usecols=["name"])["name"].astype(str))
+        result = index.neighbors(queries, k=k)
+        LOGGER.info(
+            "pipeline.neighbors",
+            extra={"extra_data": {"queries": len(queries), "k": k}},
+        )
+        return result
+
+    def update(
+        self,
+        model_path: str | Path,
+        dataframe: pd.DataFrame | None = None,
+        input_path: str | Path = "data/new_raw.parquet",
+        candidates: str | Path = "results/candidates.csv",
+        top: int | None = None,
+    ) -> OnlineUpdate:
+        """Featurize and score new raw rows and merge them into the candidate list."""
+
+        if dataframe is None:
+            dataframe = pd.read_parquet(input_path)
+        cfg = self.config.get("online", {})
+        scorer = OnlineScorer(
+            model=load(model_path),
+            top=top if top is not None else cfg.get("top", 50),
+            drift_threshold=cfg.get("drift_threshold", 0.25),
+            min_rows=cfg.get("min_rows", 50),
+            significance=cfg.get("significance", 0.01),
+        )
+        candidates_path = Path(candidates)
+        existing = pd.read_csv(candidates_path) if candidates_path.exists() else None
+        result = scorer.update(self.build_features(dataframe), existing)
+        candidates_path.parent.mkdir(parents=True, exist_ok=True)
+        result.candidates.to_csv(candidates_path, index=False)
+        LOGGER.info(
+            "pipeline.update",
+            extra={
+                "extra_data": {
+                    "rows": len(dataframe),
+                    "candidates": len(result.candidates),
+                    "output": str(candidates_path),
+                    "retrain": result.retrain,
+                }
+            },
+        )
+        return result
+
+    def sweep(
+        self,
+        features: pd.DataFrame | None = None,
+        input_path: str | Path = "data/features.parquet",
+        output: str | Path | None = "results/sweep.csv",
+        n_jobs: int | None = None,
+    ) -> pd.DataFrame:
+        cfg = self.config.get("sweep", {})
+        if features is not None:
+            matrix = feature_matrix(features)
+        else:
+            matrix = self._feature_matrix(input_path)
+        contamination = self.config.get("anomaly", {}).get("contamination", 0.05)
+        default_grid = {"contamination": [contamination]}
+        runner = SweepRunner(
+            grid=cfg.get("grid", default_grid),
+            seeds=list(cfg.get("seeds", [0, 1, 2])),
+            top_k=cfg.get("top_k", 50),
+            n_jobs=n_jobs if n_jobs is not None else cfg.get("n_jobs", -1),
+        )
+        report = runner.run(matrix)
+        if output is not None:
+            output_path = Path(output)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            report.to_csv(output_path, index=False)
+            LOGGER.info(
+                "pipeline.sweep",
+                extra={"extra_data": {"configurations": len(report), "output": str(output_path)}},
+            )
+        return report
+
+    def barrow_sweep(
+        self,
+        model_path: str | Path | None = None,
+        features: pd.DataFrame | None = None,
+        input_path: str | Path = "data/features.parquet",
+        output: str | Path | None = "results/barrow_sweep.csv",
+    ) -> pd.DataFrame:
+        """Report Barrow level populations and top-K shifts across a threshold grid."""
+
+        cfg = self.config.get("barrow_sweep", {})
+        model: AnomalyModel | None = load(model_path) if model_path is not None else None
         if features is None:
-            features = pd.read_parquet(input_path)
-        model: AnomalyModel = load(model_path)
-        scores = model.rank(features, top=top)
+            columns = FEATURE_COLUMNS if model is not None else list(BARROW_INPUTS)
+            available = pq.ParquetFile(input_path).schema_arrow.names
+            features = pd.read_parquet(
+                input_path, columns=[column for column in columns if column in available]
+            )
+        sweep = BarrowSweep(
+            grid=cfg.get("grid", {}),
+            baseline=self._kb_calculator().thresholds,
+            top_k=cfg.get("top_k", 50),
+        )
+        report = sweep.run(features, model)
         if output is not None:
             output_path = Path(output)
             output_path.parent.mkdir(parents=True, exist_ok=True)
-            scores.to_csv(output_path, index=False)
+            report.to_csv(output_path, index=False)
             LOGGER.info(
-                "pipeline.score",
-                extra={
-                    "extra_data": {
-                        "rows": len(features),
-                        "top": top,
-                        "output": str(output_path),
-                    }
-                },
+                "pipeline.barrow_sweep",
+                extra={"extra_data": {"threshold_sets": len(report), "output": str(output_path)}},
             )
-        return scores
+        return report
+
+    def broker(self) -> TaskBroker:
+        cfg = self.config.get("distributed", {})
+        backend = cfg.get("backend", "sqlite")
+        if backend not in BROKERS:
+            raise ValueError(
+                f"Unknown distributed backend: {backend} (expected one of {sorted(BROKERS)})"
+            )
+        return BROKERS[backend](
+            cfg.get("broker", "data/distributed/broker.sqlite"),
+            max_attempts=cfg.get("max_attempts", 3),
+        )
+
+    def submit(
+        self,
+        kind: str,
+        input_path: str | Path,
+        model_path: str | Path | None = None,
+        partitions: int | None = None,
+    ) -> str:
+        """Split a featurize or score run into partition tasks and publish them."""
+
+        if kind not in ("featurize", "score"):
+            raise ValueError(f"Unsupported distributed stage: {kind}")
+        if kind == "score" and model_path is None:
+            raise ValueError("Distributed scoring requires a model_path")
+        cfg = self.config.get("distributed", {})
+        job_id = uuid.uuid4().hex
+        work_dir = Path(cfg.get("work_dir", "data/distributed")) / job_id
+        descriptors = split_parquet(
+            input_path, work_dir / "inputs", partitions or cfg.get("partitions", 8)
+        )
+        payloads = default_payloads(descriptors, work_dir / "outputs", kind)
+        metadata = {
+            "config": self.config,
+            "input_path": str(input_path),
+            "model_path": str(model_path) if model_path is not None else None,
+        }
+        self.broker().publish(job_id, kind, payloads, metadata)
+        LOGGER.info(
+            "pipeline.submit",
+            extra={"extra_data": {"job_id": job_id, "kind": kind, "tasks": len(payloads)}},
+        )
+        return job_id
+
+    def work(self, poll_interval: float = 1.0, idle_timeout: float | None = None) -> int:
+        """Run a worker loop against the configured broker; returns tasks processed."""
+
+        worker = Worker(
+            broker=self.broker(),
+            handlers={
+                "featurize": Pipeline._featurize_partition,
+                "score": Pipeline._score_partition,
+            },
+            lease_seconds=self.config.get("distributed", {}).get("lease_seconds", 600.0),
+        )
+        return worker.run(poll_interval=poll_interval, idle_timeout=idle_timeout)
+
+    def collect(self, job_id: str, output: str | Path, top: int = 50) -> pd.DataFrame:
+        """Merge a finished job's partitions deterministically and write the stage output.
+
+        Featurize partitions are concatenated in partition order. Score partitions are
+        concatenated the same way and ranked with a stable sort, so ties resolve by catalogue
+        position regardless of which worker finished first.
+        """
+
+        broker = self.broker()
+        job = broker.job(job_id)
+        kind = job["kind"]
+        merged = collect_outputs(broker, job_id)
+        if kind == "score" and "anomaly" not in merged:
+            # An empty input publishes no tasks; keep the columns and dtypes of a scored run.
+            merged = Pipeline._empty_scores(job.get("input_path"))
+        output = Path(output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        if kind == "featurize":
+            merged.to_parquet(output)
+            result = merged
+        else:
+            result = merged.sort_values("anomaly", ascending=False, kind="stable").head(top)
+            result["rank"] = range(1, len(result) + 1)
+            result.to_csv(output, index=False)
+        LOGGER.info(
+            "pipeline.collect",
+            extra={
+                "extra_data": {
+                    "job_id": job_id,
+                    "kind": kind,
+                    "rows": len(merged),
+                    "output": str(output),
+                }
+            },
+        )
+        return result
+
+    @staticmethod
+    def _empty_scores(input_path: str | None) -> pd.DataFrame:
+        if input_path and Path(input_path).exists():
+            empty = pq.read_schema(input_path).empty_table().to_pandas()
+        else:
+            empty = pd.DataFrame()
+        return empty.assign(anomaly=pd.Series(dtype=float))
+
+    @staticmethod
+    def _featurize_partition(job: dict, payload: dict) -> None:
+        raw = pd.read_parquet(payload["input"])
+        if isinstance(raw.index, pd.RangeIndex):
+            raw.index = pd.RangeIndex(payload["start"], payload["start"] + len(raw))
+        features = Pipeline(config=job["config"]).build_features(raw)
+        write_atomic(features, payload["output"])
+
+    @staticmethod
+    def _score_partition(job: dict, payload: dict) -> None:
+        model: AnomalyModel = load(job["model_path"])
+        features = pd.read_parquet(payload["input"])
+        scored = features.copy()
+        if model.is_ensemble:
+            for column, values in model.score_ensemble(features).items():
+                scored[column] = values.to_numpy()
+        else:
+            scored["anomaly"] = model.score(features).to_numpy()
+        write_atomic(scored, payload["output"])
+
+    @staticmethod
+    def _rank_cached(
+        model: AnomalyModel, cache: FeatureCache, input_path: str | Path, top: int
+    ) -> tuple[pd.DataFrame, pd.DataFrame | np.ndarray]:
+        """Score the cached matrix and decode only the row groups holding the top rows.
+
+        Returns the ranked top rows and the scores of every row.
+        """
+
+        matrix = cache.load(input_path)
+        if model.is_ensemble:
+            all_scores = model.score_ensemble(matrix)
+            values = all_scores["anomaly"].to_numpy()
+        else:
+            all_scores = values = model.score(matrix).to_numpy()
+        order = np.argsort(-values, kind="stable")[:top]
+        picked = all_scores.iloc[order] if isinstance(all_scores, pd.DataFrame) else values[order]
+        subset = read_rows(input_path, order)
+        ranked = model.rank(subset, top=top, scores=picked)
+        return ranked, all_scores
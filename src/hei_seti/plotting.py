@@ -0,0 +1,144 @@
+"""Density rendering of the K×B landscape for catalogues of any size."""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from .scales import BarrowLevel
+
+LOGGER = logging.getLogger(__name__)
+
+BARROW_LEVELS = np.array([int(level) for level in BarrowLevel])
+
+
+@dataclass(slots=True)
+class KBHistogram:
+    """Counts of catalogue rows per (Barrow level, Kardashev bin)."""
+
+    counts: np.ndarray
+    k_edges: np.ndarray
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+
+def _k_range_from_statistics(parquet: pq.ParquetFile) -> tuple[float, float] | None:
+    column = parquet.schema_arrow.get_field_index("K")
+    lows, highs = [], []
+    for group in range(parquet.metadata.num_row_groups):
+        stats = parquet.metadata.row_group(group).column(column).statistics
+        if stats is None or not stats.has_min_max:
+            return None
+        lows.append(stats.min)
+        highs.append(stats.max)
+    if not lows:
+        return None
+    low, high = float(np.min(lows)), float(np.max(highs))
+    return (low, high) if np.isfinite(low) and np.isfinite(high) else None
+
+
+def _k_range_from_scan(parquet: pq.ParquetFile, batch_size: int) -> tuple[float, float]:
+    low, high = np.inf, -np.inf
+    for batch in parquet.iter_batches(columns=["K"], batch_size=batch_size):
+        values = batch.column(0).to_numpy(zero_copy_only=False).astype(float)
+        values = values[np.isfinite(values)]
+        if len(values):
+            low, high = min(low, values.min()), max(high, values.max())
+    return (float(low), float(high)) if np.isfinite(low) else (0.0, 1.0)
+
+
+def kb_histogram(path: str | Path, k_bins: int = 200, batch_size: int = 1 << 20) -> KBHistogram:
+    """Bin the `K`/`B` columns of a features Parquet file in bounded-memory batches.
+
+    Only the two columns are decoded. The K range comes from the row-group statistics in
+    the Parquet footer when available, so the binning is a single pass over the data.
+    """
+
+    parquet = pq.ParquetFile(path)
+    k_range = _k_range_from_statistics(parquet) or _k_range_from_scan(parquet, batch_size)
+    low, high = k_range
+    if high <= low:
+        high = low + 1.0
+    k_edges = np.linspace(low, high, k_bins + 1)
+    width = (high - low) / k_bins
+    flat = np.zeros(len(BARROW_LEVELS) * k_bins, dtype=np.int64)
+    for batch in parquet.iter_batches(columns=["K", "B"], batch_size=batch_size):
+        k = batch.column(0).to_numpy(zero_copy_only=False).astype(float)
+        b = batch.column(1).to_numpy(zero_copy_only=False).astype(float)
+        valid = np.isfinite(k) & np.isfinite(b)
+        k_index = np.clip(((k[valid] - low) / width).astype(np.int64), 0, k_bins - 1)
+        b_index = np.rint(b[valid]).astype(np.int64) - BARROW_LEVELS[0]
+        b_index = np.clip(b_index, 0, len(BARROW_LEVELS) - 1)
+        flat += np.bincount(b_index * k_bins + k_index, minlength=flat.size)
+    histogram = KBHistogram(counts=flat.reshape(len(BARROW_LEVELS), k_bins), k_edges=k_edges)
+    LOGGER.info(
+        "plotting.histogram",
+        extra={"extra_data": {"path": str(path), "rows": histogram.total, "k_bins": k_bins}},
+    )
+    return histogram
+
+
+def render_kb_density(
+    histogram: KBHistogram,
+    output: str | Path,
+    candidates: pd.DataFrame | None = None,
+) -> Path:
+    """Render a binned K×B histogram with an optional candidate overlay to an image file.
+
+    Uses matplotlib's Agg canvas directly rather than `pyplot`, so no interactive backend
+    is loaded and the cost depends only on the number of bins, not catalogue rows.
+    """
+
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.colors import LogNorm
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(8, 6))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    b_edges = np.append(BARROW_LEVELS - 0.5, BARROW_LEVELS[-1] + 0.5)
+    counts = np.ma.masked_equal(histogram.counts, 0)
+    if counts.count():
+        mesh = ax.pcolormesh(
+            histogram.k_edges, b_edges, counts, norm=LogNorm(vmin=1), cmap="viridis"
+        )
+        fig.colorbar(mesh, ax=ax, label="catalogue sources")
+    if candidates is not None and len(candidates):
+        ax.scatter(
+            candidates["K"], candidates["B"], marker="x", s=80, color="crimson", label="candidates"
+        )
+        ax.legend()
+    ax.set_xlabel("Kardashev K")
+    ax.set_ylabel("Barrow level")
+    ax.set_yticks(BARROW_LEVELS)
+    ax.set_title("K×B candidate landscape")
+    fig.tight_layout()
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(output)
+    LOGGER.info(
+        "plotting.render",
+        extra={"extra_data": {"output": str(output), "rows": histogram.total}},
+    )
+    return output
+
+
+def plot_kb_space(
+    features_path: str | Path,
+    output: str | Path,
+    candidates_path: str | Path | None = None,
+    k_bins: int = 200,
+) -> Path:
+    """Bin a features file and render it, overlaying candidates when the CSV exists."""
+
+    histogram = kb_histogram(features_path, k_bins=k_bins)
+    candidates = None
+    if candidates_path is not None and Path(candidates_path).exists():
+        candidates = pd.read_csv(candidates_path, usecols=["K", "B"])
+    return render_kb_density(histogram, output, candidates=candidates)
@@ -0,0 +1,355 @@
+"""Streaming data-quality profiles of catalogue and feature columns."""
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from joblib import Parallel, delayed, effective_n_jobs, parallel_config
+
+LOGGER = logging.getLogger(__name__)
+
+ALL_TABLES = "__all__"
+NO_SOURCE = "<none>"
+DEFAULT_QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+@dataclass(slots=True)
+class QuantileSketch:
+    """Mergeable quantile sketch with relative-error guarantees (DDSketch-style).
+
+    Values are counted in logarithmic buckets of ratio `gamma = (1 + a) / (1 - a)`, so any
+    reported quantile is within relative error `a` of a true sample value. Sketches built
+    over disjoint chunks merge exactly by adding bucket counts. When the buckets of one
+    sign exceed `max_buckets`, the smallest-magnitude buckets are folded together, which
+    only affects accuracy near zero.
+    """
+
+    relative_accuracy: float = 0.01
+    max_buckets: int = 2048
+    positive: dict[int, int] = field(default_factory=dict)
+    negative: dict[int, int] = field(default_factory=dict)
+    zeros: int = 0
+
+    @property
+    def gamma(self) -> float:
+        return (1.0 + self.relative_accuracy) / (1.0 - self.relative_accuracy)
+
+    @property
+    def count(self) -> int:
+        return self.zeros + sum(self.positive.values()) + sum(self.negative.values())
+
+    def _add(self, store: dict[int, int], magnitudes: np.ndarray) -> None:
+        if len(magnitudes) == 0:
+            return
+        indices = np.ceil(np.log(magnitudes) / math.log(self.gamma)).astype(np.int64)
+        keys, counts = np.unique(indices, return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            store[key] = store.get(key, 0) + count
+        self._collapse(store)
+
+    def _collapse(self, store: dict[int, int]) -> None:
+        if len(store) <= self.max_buckets:
+            return
+        keys = sorted(store)
+        folded = keys[: len(keys) - self.max_buckets + 1]
+        total = sum(store.pop(key) for key in folded)
+        store[folded[-1]] = total
+
+    def update(self, values: np.ndarray) -> None:
+        """Add the finite entries of `values`."""
+
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        tiny = np.finfo(float).tiny
+        self.zeros += int((np.abs(values) < tiny).sum())
+        self._add(self.positive, values[values >= tiny])
+        self._add(self.negative, -values[values <= -tiny])
+
+    def merge(self, other: QuantileSketch) -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for store, incoming in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in incoming.items():
+                store[key] = store.get(key, 0) + count
+            self._collapse(store)
+        self.zeros += other.zeros
+
+    def _value(self, index: int) -> float:
+        return 2.0 * self.gamma**index / (self.gamma + 1.0)
+
+    def quantiles(self, qs: Iterable[float]) -> list[float]:
+        """Return the approximate value at each quantile in `qs` (NaN when empty)."""
+
+        total = self.count
+        qs = list(qs)
+        if total == 0:
+            return [math.nan] * len(qs)
+        ordered = [(-self._value(key), count) for key, count in sorted(self.negative.items())[::-1]]
+        ordered.append((0.0, self.zeros))
+        ordered.extend((self._value(key), count) for key, count in sorted(self.positive.items()))
+        values = np.array([value for value, _ in ordered])
+        cumulative = np.cumsum([count for _, count in ordered])
+        ranks = np.asarray(qs, dtype=float) * (total - 1)
+        return values[np.searchsorted(cumulative, ranks, side="right")].tolist()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_buckets": self.max_buckets,
+            "positive": {str(key): count for key, count in self.positive.items()},
+            "negative": {str(key): count for key, count in self.negative.items()},
+            "zeros": self.zeros,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> QuantileSketch:
+        return cls(
+            relative_accuracy=data["relative_accuracy"],
+            max_buckets=data["max_buckets"],
+            positive={int(key): count for key, count in data["positive"].items()},
+            negative={int(key): count for key, count in data["negative"].items()},
+            zeros=data["zeros"],
+        )
+
+
+@dataclass(slots=True)
+class ColumnProfile:
+    """Row, null, extrema and quantile-sketch summary of one column."""
+
+    rows: int = 0
+    nulls: int = 0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+    sketch: QuantileSketch | None = None
+
+    def update(self, values: pd.Series, relative_accuracy: float) -> None:
+        self.rows += len(values)
+        self.nulls += int(values.isna().sum())
+        if not pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+            return
+        numeric = values.to_numpy(dtype=float, na_value=np.nan)
+        finite = numeric[np.isfinite(numeric)]
+        if self.sketch is None:
+            self.sketch = QuantileSketch(relative_accuracy=relative_accuracy)
+        if len(finite):
+            self.minimum = min(self.minimum, float(finite.min()))
+            self.maximum = max(self.maximum, float(finite.max()))
+            self.sketch.update(finite)
+
+    def merge(self, other: ColumnProfile) -> None:
+        self.rows += other.rows
+        self.nulls += other.nulls
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        if other.sketch is not None:
+            if self.sketch is None:
+                self.sketch = QuantileSketch(relative_accuracy=other.sketch.relative_accuracy)
+            self.sketch.merge(other.sketch)
+
+    def report(self, quantiles: Iterable[float]) -> dict[str, Any]:
+        result: dict[str, Any] = {
+            "rows": self.rows,
+            "nulls": self.nulls,
+            "coverage": (self.rows - self.nulls) / self.rows if self.rows else 0.0,
+        }
+        if self.sketch is not None:
+            quantiles = list(quantiles)
+            finite = math.isfinite(self.minimum)
+            result["min"] = self.minimum if finite else None
+            result["max"] = self.maximum if finite else None
+            result["quantiles"] = {
+                f"p{q * 100:g}": (value if finite else None)
+                for q, value in zip(quantiles, self.sketch.quantiles(quantiles))
+            }
+        return result
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "nulls": self.nulls,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "sketch": self.sketch.to_dict() if self.sketch is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> ColumnProfile:
+        sketch = data["sketch"]
+        return cls(
+            rows=data["rows"],
+            nulls=data["nulls"],
+            minimum=data["minimum"],
+            maximum=data["maximum"],
+            sketch=QuantileSketch.from_dict(sketch) if sketch is not None else None,
+        )
+
+
+@dataclass(slots=True)
+class Profile:
+    """Per-`_source_table` column profiles plus the provenance of each coalesced feature.
+
+    `columns[table][column]` profiles raw columns and the derived feature columns (prefixed
+    `feature:`); `sources[table][feature][column]` counts the rows where that candidate
+    column supplied the feature's value (`<none>` when no candidate had one). The table
+    `__all__` aggregates every row. Profiles of disjoint chunks merge exactly.
+    """
+
+    relative_accuracy: float = 0.01
+    columns: dict[str, dict[str, ColumnProfile]] = field(default_factory=dict)
+    sources: dict[str, dict[str, dict[str, int]]] = field(default_factory=dict)
+
+    def _column(self, table: str, column: str) -> ColumnProfile:
+        return self.columns.setdefault(table, {}).setdefault(column, ColumnProfile())
+
+    def _count_sources(self, table: str, feature: str, counts: Mapping[str, int]) -> None:
+        target = self.sources.setdefault(table, {}).setdefault(feature, {})
+        for column, count in counts.items():
+            target[column] = target.get(column, 0) + int(count)
+
+    def merge(self, other: Profile) -> None:
+        for table, columns in other.columns.items():
+            for column, profile in columns.items():
+                self._column(table, column).merge(profile)
+        for table, features in other.sources.items():
+            for feature, counts in features.items():
+                self._count_sources(table, feature, counts)
+
+    def report(self, quantiles: Iterable[float] = DEFAULT_QUANTILES) -> dict[str, Any]:
+        quantiles = list(quantiles)
+        return {
+            table: {
+                "rows": max((profile.rows for profile in columns.values()), default=0),
+                "columns": {
+                    column: profile.report(quantiles) for column, profile in columns.items()
+                },
+                "sources": self.sources.get(table, {}),
+            }
+            for table, columns in sorted(self.columns.items())
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "columns": {
+                table: {column: profile.to_dict() for column, profile in columns.items()}
+                for table, columns in self.columns.items()
+            },
+            "sources": self.sources,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> Profile:
+        return cls(
+            relative_accuracy=data["relative_accuracy"],
+            columns={
+                table: {column: ColumnProfile.from_dict(item) for column, item in columns.items()}
+                for table, columns in data["columns"].items()
+            },
+            sources={
+                table: {feature: dict(counts) for feature, counts in features.items()}
+                for table, features in data["sources"].items()
+            },
+        )
+
+
+def coalesce_with_source(
+    df: pd.DataFrame, candidates: Iterable[str]
+) -> tuple[pd.Series, pd.Series]:
+    """Vectorised `FeatureBuilder._first_valid`: the values and which column supplied them."""
+
+    present = [column for column in candidates if column in df]
+    if not present:
+        return (
+            pd.Series(np.nan, index=df.index),
+            pd.Series(NO_SOURCE, index=df.index, dtype=object),
+        )
+    valid = df[present].notna().to_numpy()
+    first = valid.argmax(axis=1)
+    found = valid.any(axis=1)
+    stacked = np.column_stack(
+        [pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float) for column in present]
+    )
+    values = np.where(found, stacked[np.arange(len(df)), first], np.nan)
+    labels = np.where(found, np.asarray(present, dtype=object)[first], NO_SOURCE)
+    return pd.Series(values, index=df.index), pd.Series(labels, index=df.index, dtype=object)
+
+
+@dataclass(slots=True)
+class Profiler:
+    """Accumulate a `Profile` over dataframe chunks of a raw catalogue or feature table.
+
+    `feature_sources` maps derived feature names to their candidate columns (as in the
+    `features:` config), mirroring how `FeatureBuilder` coalesces them.
+    """
+
+    feature_sources: Mapping[str, Iterable[str]] = field(default_factory=dict)
+    relative_accuracy: float = 0.01
+
+    def profile_frame(self, df: pd.DataFrame) -> Profile:
+        profile = Profile(relative_accuracy=self.relative_accuracy)
+        derived: dict[str, pd.Series] = {}
+        supplied: dict[str, pd.Series] = {}
+        for feature, candidates in self.feature_sources.items():
+            derived[feature], supplied[feature] = coalesce_with_source(df, list(candidates))
+        if {"flux_max", "flux_min"}.issubset(df.columns):
+            ratio = df["flux_max"] / df["flux_min"].replace({0: np.nan})
+            derived["var_ratio"] = ratio.replace([np.inf, -np.inf], np.nan)
+
+        tables = df["_source_table"].astype(str) if "_source_table" in df else None
+        groups = [(ALL_TABLES, slice(None))]
+        if tables is not None:
+            groups += [(table, (tables == table).to_numpy()) for table in tables.unique()]
+        for table, rows in groups:
+            for column in df.columns:
+                if column != "_source_table":
+                    profile._column(table, column).update(df[column][rows], self.relative_accuracy)
+            for feature, values in derived.items():
+                profile._column(table, f"feature:{feature}").update(
+                    values[rows], self.relative_accuracy
+                )
+            for feature, labels in supplied.items():
+                profile._count_sources(table, feature, labels[rows].value_counts().to_dict())
+        return profile
+
+    def profile_parquet(
+        self, path: str | Path, batch_size: int = 65536, row_groups: list[int] | None = None
+    ) -> Profile:
+        """Stream `path` (optionally only `row_groups`) in batches and merge their profiles."""
+
+        profile = Profile(relative_accuracy=self.relative_accuracy)
+        parquet = pq.ParquetFile(path)
+        for batch in parquet.iter_batches(batch_size=batch_size, row_groups=row_groups):
+            profile.merge(self.profile_frame(batch.to_pandas()))
+        return profile
+
+    def run(self, path: str | Path, batch_size: int = 65536, n_jobs: int = 1) -> Profile:
+        """Profile a Parquet file, splitting its row groups across `n_jobs` processes."""
+
+        groups = pq.ParquetFile(path).num_row_groups
+        # joblib semantics (-1 = every CPU), but never more workers than row groups.
+        workers = min(groups, effective_n_jobs(n_jobs))
+        LOGGER.info(
+            "profile.start",
+            extra={"extra_data": {"input": str(path), "row_groups": groups, "workers": workers}},
+        )
+        if workers <= 1:
+            return self.profile_parquet(path, batch_size)
+        shards = [part.tolist() for part in np.array_split(np.arange(groups), workers)]
+        with parallel_config(backend="loky", inner_max_num_threads=1):
+            parts = Parallel(n_jobs=workers)(
+                delayed(_profile_shard)(self, str(path), batch_size, shard) for shard in shards
+            )
+        profile = Profile(relative_accuracy=self.relative_accuracy)
+        for part in parts:
+            profile.merge(Profile.from_dict(part))
+        return profile
+
+
+def _profile_shard(profiler: Profiler, path: str, batch_size: int, row_groups: list[int]) -> dict:
+    return profiler.profile_parquet(path, batch_size, row_groups).to_dict()
@@ -39,6 +39,14 @@ class KardashevRating:
         return value
 
 
+def kardashev_from_power(power_watts: np.ndarray) -> np.ndarray:
+    """Vectorised `KardashevRating.value`: `(log10(P) - 6)/10`, NaN where P is not positive."""
+
+    power = np.asarray(power_watts, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(power > 0, (np.log10(power) - 6.0) / 10.0, np.nan)
+
+
 def normalize_barrow_levels(levels: Iterable[int | float | BarrowLevel]) -> list[int]:
     """Normalize a collection of barrow levels to integers.
 
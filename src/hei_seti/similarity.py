@@ -0,0 +1,108 @@
+"""Nearest-neighbour search over the standardised anomaly feature space."""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+from joblib import dump, load
+from scipy.spatial import cKDTree
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class SimilarityIndex:
+    """KD-tree over `FEATURE_COLUMNS` standardised to zero mean and unit variance.
+
+    Built from the same prepared matrix the anomaly model trains on and stored next to the
+    model artifact, so "systems like this candidate" become tree queries instead of a scan
+    of `features.parquet`. Batch queries are spread across cores by `cKDTree`.
+    """
+
+    names: np.ndarray
+    center: np.ndarray
+    scale: np.ndarray
+    tree: cKDTree
+    lookup: pd.Series
+
+    @classmethod
+    def build(
+        cls, matrix: np.ndarray, names: Iterable[object], leafsize: int = 32
+    ) -> SimilarityIndex:
+        matrix = np.asarray(matrix, dtype=float)
+        center = matrix.mean(axis=0)
+        scale = matrix.std(axis=0)
+        scale[scale == 0] = 1.0
+        names = np.asarray([str(name) for name in names], dtype=object)
+        if len(names) != len(matrix):
+            raise ValueError("names must align with matrix rows")
+        tree = cKDTree((matrix - center) / scale, leafsize=leafsize)
+        lookup = pd.Series(np.arange(len(names)), index=names)
+        lookup = lookup[~lookup.index.duplicated(keep="first")]
+        LOGGER.info(
+            "similarity.build",
+            extra={"extra_data": {"rows": len(matrix), "leafsize": leafsize}},
+        )
+        return cls(names=names, center=center, scale=scale, tree=tree, lookup=lookup)
+
+    @staticmethod
+    def path_for(model_path: str | Path) -> Path:
+        model_path = Path(model_path)
+        return model_path.with_name(f"{model_path.stem}.neighbors.joblib")
+
+    def save(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        dump(self, path)
+        return path
+
+    @staticmethod
+    def load(path: str | Path) -> SimilarityIndex:
+        return load(path)
+
+    def query(self, matrix: np.ndarray, k: int = 10) -> tuple[np.ndarray, np.ndarray]:
+        """Return `(distances, row_indices)` of the `k` nearest rows for each query row."""
+
+        points = (np.atleast_2d(np.asarray(matrix, dtype=float)) - self.center) / self.scale
+        distances, indices = self.tree.query(points, k=k, workers=-1)
+        return distances.reshape(len(points), k), indices.reshape(len(points), k)
+
+    def neighbors(self, names: Iterable[object], k: int = 10) -> pd.DataFrame:
+        """Return the `k` nearest catalogue systems for every named source at once.
+
+        Each source is excluded from its own neighbour list. The result has one row per
+        (query, neighbour) pair with columns `query`, `neighbor`, `distance` and `rank`.
+        """
+
+        queries = [str(name) for name in names]
+        lookup = self.lookup.reindex(queries)
+        missing = lookup.index[lookup.isna()].tolist()
+        if missing:
+            raise KeyError(f"Unknown sources: {missing}")
+        k = min(k, len(self.names) - 1)
+        if k < 1 or not queries:
+            return pd.DataFrame(columns=["query", "neighbor", "distance", "rank"])
+
+        rows = lookup.to_numpy(dtype=np.int64)
+        distances, indices = self.tree.query(self.tree.data[rows], k=k + 1, workers=-1)
+        # Push each query's own row to the end, then keep the first k remaining neighbours.
+        order = np.argsort(indices == rows[:, None], axis=1, kind="stable")[:, :k]
+        indices = np.take_along_axis(indices, order, axis=1)
+        distances = np.take_along_axis(distances, order, axis=1)
+        result = pd.DataFrame(
+            {
+                "query": np.repeat(queries, k),
+                "neighbor": self.names[indices.ravel()],
+                "distance": distances.ravel(),
+                "rank": np.tile(np.arange(1, k + 1), len(queries)),
+            }
+        )
+        LOGGER.info(
+            "similarity.neighbors",
+            extra={"extra_data": {"queries": len(queries), "k": k}},
+        )
+        return result
@@ -0,0 +1,155 @@
+"""Content-addressed cache of pipeline stage outputs."""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+from .feature_cache import code_version, stat_digest
+
+LOGGER = logging.getLogger(__name__)
+
+META_FILE = "meta.json"
+STAT_DIR = "stat"
+
+
+def stage_key(
+    stage: str,
+    digests: Iterable[str],
+    config: Mapping[str, Any] | None = None,
+    extra: Mapping[str, Any] | None = None,
+) -> str:
+    """Hash a stage name, its input content digests, config, extra arguments and code."""
+
+    payload = {
+        "stage": stage,
+        "inputs": list(digests),
+        "config": config or {},
+        "extra": extra or {},
+        "code": code_version(),
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+@dataclass(slots=True)
+class StageCache:
+    """Store each stage's output files under a key derived from everything that shaped them.
+
+    A key hashes the stage name, the content digests of its input artifacts, the config
+    subsections it consumes, any extra arguments, and `code_version()`. Entries live in
+    `<directory>/<stage>/<key>/` with a `meta.json`; when `max_bytes` is set the least
+    recently used entries are evicted after each store. Input digests are remembered in
+    `<directory>/stat/` per (path, size, mtime_ns), so computing a key only re-hashes
+    inputs that were rewritten.
+    """
+
+    directory: str | Path = ".hei_cache"
+    max_bytes: int | None = None
+
+    def key(
+        self,
+        stage: str,
+        inputs: Iterable[str | Path] = (),
+        config: Mapping[str, Any] | None = None,
+        extra: Mapping[str, Any] | None = None,
+    ) -> str:
+        digests = [stat_digest(path, Path(self.directory) / STAT_DIR) for path in inputs]
+        return stage_key(stage, digests, config, extra)
+
+    def _entry(self, stage: str, key: str) -> Path:
+        return Path(self.directory) / stage / key
+
+    def restore(self, stage: str, key: str, outputs: Iterable[str | Path]) -> bool:
+        """Copy a cached entry's files to `outputs`; return False on a miss."""
+
+        entry = self._entry(stage, key)
+        meta_path = entry / META_FILE
+        if not meta_path.exists():
+            return False
+        outputs = [Path(output) for output in outputs]
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if len(meta["files"]) != len(outputs):
+            return False
+        for name, output in zip(meta["files"], outputs):
+            output.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(entry / name, output)
+        meta["last_used"] = time.time()
+        meta_path.write_text(json.dumps(meta), encoding="utf-8")
+        LOGGER.info("stage_cache.hit", extra={"extra_data": {"stage": stage, "key": key}})
+        return True
+
+    def store(self, stage: str, key: str, outputs: Iterable[str | Path]) -> None:
+        entry = self._entry(stage, key)
+        staging = entry.with_name(f"{key}.tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        files, size = [], 0
+        for position, output in enumerate(Path(output) for output in outputs):
+            name = f"{position}{output.suffix}"
+            shutil.copy2(output, staging / name)
+            files.append(name)
+            size += output.stat().st_size
+        now = time.time()
+        meta = {
+            "stage": stage,
+            "key": key,
+            "files": files,
+            "bytes": size,
+            "created": now,
+            "last_used": now,
+        }
+        (staging / META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+        shutil.rmtree(entry, ignore_errors=True)
+        staging.rename(entry)
+        LOGGER.info(
+            "stage_cache.store",
+            extra={"extra_data": {"stage": stage, "key": key, "bytes": size}},
+        )
+        if self.max_bytes is not None:
+            self.gc(self.max_bytes)
+
+    def entries(self) -> list[dict[str, Any]]:
+        """Return metadata for every cache entry, least recently used first."""
+
+        found = []
+        for meta_path in Path(self.directory).glob(f"*/*/{META_FILE}"):
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            meta["path"] = str(meta_path.parent)
+            found.append(meta)
+        return sorted(found, key=lambda meta: meta["last_used"])
+
+    def gc(self, max_bytes: int | None = None) -> list[dict[str, Any]]:
+        """Evict least recently used entries until the cache fits in `max_bytes`."""
+
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        if limit is None:
+            return []
+        total = sum(entry["bytes"] for entry in entries)
+        evicted = []
+        for entry in entries:
+            if total <= limit:
+                break
+            shutil.rmtree(entry["path"], ignore_errors=True)
+            total -= entry["bytes"]
+            evicted.append(entry)
+        LOGGER.info(
+            "stage_cache.gc",
+            extra={"extra_data": {"evicted": len(evicted), "bytes": total, "limit": limit}},
+        )
+        return evicted
+
+    def clear(self) -> int:
+        """Remove every entry and return how many were deleted."""
+
+        entries = self.entries()
+        for entry in entries:
+            shutil.rmtree(entry["path"], ignore_errors=True)
+        shutil.rmtree(Path(self.directory) / STAT_DIR, ignore_errors=True)
+        return len(entries)
@@ -0,0 +1,336 @@
+"""Indexed SQLite store of per-row features and anomaly scores across runs."""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+LOGGER = logging.getLogger(__name__)
+
+RUN_TABLE_COLUMNS = {
+    "run": "INTEGER PRIMARY KEY",
+    "run_id": "TEXT NOT NULL UNIQUE",
+    "kind": "TEXT NOT NULL",
+    "created": "REAL NOT NULL",
+    "input": "TEXT",
+    "model_id": "TEXT",
+    "rows": "INTEGER",
+    "metadata": "TEXT",
+    "run_key": "TEXT",
+}
+FEATURE_TABLE_COLUMNS = {
+    "name": "TEXT",
+    "_source_table": "TEXT",
+    "flux": "REAL",
+    "hardness": "REAL",
+    "period": "REAL",
+    "bh_mass": "REAL",
+    "var_ratio": "REAL",
+    "K": "REAL",
+    "B": "INTEGER",
+}
+SCORE_TABLE_COLUMNS = {
+    "name": "TEXT",
+    "_source_table": "TEXT",
+    "K": "REAL",
+    "B": "INTEGER",
+    "anomaly": "REAL",
+    "anomaly_std": "REAL",
+    "rank_var": "REAL",
+}
+TABLES = {"features": FEATURE_TABLE_COLUMNS, "scores": SCORE_TABLE_COLUMNS}
+INDEXED_COLUMNS = {
+    "features": ("name", "_source_table", "K", "B"),
+    "scores": ("name", "_source_table", "K", "B", "anomaly"),
+}
+
+# Page cache for bulk writes, so index B-trees stay in memory while a run is inserted.
+CACHE_KIB = 262144
+
+FILTER_PATTERN = re.compile(r"^\s*(\w+)\s*(<=|>=|!=|==|=|<|>)\s*(.+?)\s*$")
+
+
+class QueryError(ValueError):
+    """Raised for filters or orderings outside the whitelisted columns and operators."""
+
+
+def _indexes(table: str) -> dict[str, str]:
+    """Return `{index name: CREATE INDEX statement}` for a data table."""
+
+    # (run, column) indexes serve the usual "one run, filtered/ordered by X" query; the bare
+    # name index serves lookups of one source across runs.
+    indexes = {
+        f"{table}_{column.strip('_')}": f'(run, "{column}")' for column in INDEXED_COLUMNS[table]
+    }
+    indexes[f"{table}_name_any"] = "(name)"
+    return {
+        name: f"CREATE INDEX IF NOT EXISTS {name} ON {table} {columns}"
+        for name, columns in indexes.items()
+    }
+
+
+def _schema() -> str:
+    runs = ", ".join(f"{column} {kind}" for column, kind in RUN_TABLE_COLUMNS.items())
+    statements = [
+        f"CREATE TABLE IF NOT EXISTS runs ({runs})",
+        "CREATE INDEX IF NOT EXISTS runs_kind ON runs (kind, created)",
+    ]
+    for table, columns in TABLES.items():
+        definitions = ", ".join(f'"{column}" {kind}' for column, kind in columns.items())
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS {table} (run INTEGER NOT NULL REFERENCES runs(run),"
+            f" row INTEGER NOT NULL, {definitions})"
+        )
+        statements.extend(_indexes(table).values())
+    return ";\n".join(statements) + ";"
+
+
+def _parse_value(text: str, kind: str) -> float | int | str:
+    """Coerce a filter value to the declared SQLite type of the column it is compared to."""
+
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "'\"":
+        text = text[1:-1]
+    if kind == "TEXT":
+        return text
+    try:
+        number = float(text)
+    except ValueError:
+        raise QueryError(f"Expected a number, got {text!r}") from None
+    return int(number) if kind == "INTEGER" and number.is_integer() else number
+
+
+@dataclass(slots=True)
+class ResultsStore:
+    """Append-only results database: one run per `featurize` or `score` invocation.
+
+    Every run gets a `run_id`; score runs also record the `model_id` (SHA-256 of the model
+    artifact) that produced them. A write may carry a `run_key` naming what determined its
+    rows (input digests, model, config and code); a second write with the same key and kind
+    is skipped and returns the existing `run_id`, so re-running an unchanged stage does not
+    duplicate the table. Rows reference their run by a small integer key to keep
+    the indexes compact, and are written in `batch_size` chunks inside one transaction.
+    When a run is larger than everything already stored for its table, the indexes are
+    dropped and rebuilt around the insert, which is several times faster than maintaining
+    them row by row. Queries only ever bind whitelisted column names and parameters.
+    """
+
+    path: str | Path
+    batch_size: int = 50000
+
+    def __post_init__(self) -> None:
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_schema())
+            existing = {row[1] for row in connection.execute("PRAGMA table_info(runs)")}
+            if "run_key" not in existing:  # databases written before run keys existed
+                connection.execute("ALTER TABLE runs ADD COLUMN run_key TEXT")
+            connection.execute("CREATE INDEX IF NOT EXISTS runs_key ON runs (kind, run_key)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def _write(
+        self,
+        table: str,
+        frame: pd.DataFrame,
+        input_path: str | Path | None,
+        model_id: str | None,
+        metadata: dict | None,
+        run_key: str | None,
+    ) -> str:
+        run_id = uuid.uuid4().hex
+        columns = list(TABLES[table])
+        placeholders = ", ".join("?" * (len(columns) + 2))
+        names = ", ".join(["run", "row"] + [f'"{column}"' for column in columns])
+        statement = f"INSERT INTO {table} ({names}) VALUES ({placeholders})"
+        with self._connect() as connection:
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA cache_size=-{CACHE_KIB}")
+            connection.execute("BEGIN IMMEDIATE")
+            if run_key is not None:
+                found = self._find(connection, table, run_key)
+                if found is not None:
+                    connection.execute("ROLLBACK")
+                    LOGGER.info(
+                        "store.skip",
+                        extra={"extra_data": {"table": table, "run_id": found}},
+                    )
+                    return found
+            stored = connection.execute(
+                "SELECT COALESCE(SUM(rows), 0) FROM runs WHERE kind = ?", (table,)
+            ).fetchone()[0]
+            rebuild = len(frame) > stored
+            if rebuild:
+                for index in _indexes(table):
+                    connection.execute(f"DROP INDEX IF EXISTS {index}")
+            cursor = connection.execute(
+                "INSERT INTO runs (run_id, kind, created, input, model_id, rows, metadata,"
+                " run_key) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    table,
+                    time.time(),
+                    str(input_path) if input_path is not None else None,
+                    model_id,
+                    len(frame),
+                    json.dumps(metadata or {}, default=str),
+                    run_key,
+                ),
+            )
+            prefix = [cursor.lastrowid]
+            for start in range(0, len(frame), self.batch_size):
+                chunk = frame.iloc[start : start + self.batch_size]
+                values = [np.arange(start, start + len(chunk)).tolist()]
+                for column in columns:
+                    if column not in chunk:
+                        values.append([None] * len(chunk))
+                        continue
+                    series = chunk[column]
+                    if column in ("name", "_source_table"):
+                        series = series.astype(str)
+                    values.append(series.astype(object).where(series.notna(), None).tolist())
+                connection.executemany(
+                    statement, (prefix + list(row) for row in zip(*values))
+                )
+            if rebuild:
+                for create in _indexes(table).values():
+                    connection.execute(create)
+            connection.execute("COMMIT")
+        LOGGER.info(
+            "store.write",
+            extra={"extra_data": {"table": table, "run_id": run_id, "rows": len(frame)}},
+        )
+        return run_id
+
+    @staticmethod
+    def _find(connection: sqlite3.Connection, kind: str, run_key: str) -> str | None:
+        row = connection.execute(
+            "SELECT run_id FROM runs WHERE kind = ? AND run_key = ? LIMIT 1", (kind, run_key)
+        ).fetchone()
+        return row[0] if row else None
+
+    def find_run(self, kind: str, run_key: str) -> str | None:
+        """Return the `run_id` of the `kind` run recorded under `run_key`, if any."""
+
+        with self._connect() as connection:
+            return self._find(connection, kind, run_key)
+
+    def write_features(
+        self,
+        features: pd.DataFrame,
+        input_path: str | Path | None = None,
+        run_key: str | None = None,
+    ) -> str:
+        """Store a full feature table as a new run (unless `run_key` exists); return its id."""
+
+        return self._write("features", features, input_path, None, None, run_key)
+
+    def write_scores(
+        self,
+        scores: pd.DataFrame,
+        model_id: str,
+        input_path: str | Path | None = None,
+        metadata: dict | None = None,
+        run_key: str | None = None,
+    ) -> str:
+        """Store anomaly scores for every row as a new run (unless `run_key` exists)."""
+
+        return self._write("scores", scores, input_path, model_id, metadata, run_key)
+
+    def runs(self, kind: str | None = None) -> pd.DataFrame:
+        """Return recorded runs, newest first."""
+
+        sql = "SELECT run_id, kind, created, input, model_id, rows FROM runs"
+        params: tuple = ()
+        if kind is not None:
+            sql += " WHERE kind = ?"
+            params = (kind,)
+        with self._connect() as connection:
+            return pd.read_sql_query(
+                sql + " ORDER BY created DESC, run DESC", connection, params=params
+            )
+
+    def latest_run(self, kind: str) -> str | None:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT run_id FROM runs WHERE kind = ? ORDER BY created DESC, run DESC LIMIT 1",
+                (kind,),
+            ).fetchone()
+        return row[0] if row else None
+
+    def query(
+        self,
+        table: str = "scores",
+        filters: Iterable[str] = (),
+        order: str | None = None,
+        limit: int | None = 50,
+        offset: int = 0,
+        run_id: str | None = None,
+    ) -> pd.DataFrame:
+        """Filter and paginate one run (the latest by default) of `table`.
+
+        Filters look like `K > 0.5` or `_source_table = xrbcatalog`; `order` is a column name,
+        prefixed with `-` for descending order.
+        """
+
+        if table not in TABLES:
+            raise QueryError(f"Unknown table: {table}")
+        allowed = {"row": "INTEGER", **TABLES[table]}
+        run_id = run_id or self.latest_run(table)
+        with self._connect() as connection:
+            found = connection.execute(
+                "SELECT run, model_id FROM runs WHERE run_id = ? AND kind = ?", (run_id, table)
+            ).fetchone()
+        if found is None:
+            raise QueryError(f"No {table} run found: {run_id}")
+        run, model_id = found
+        clauses, params = ["run = ?"], [run]
+        for expression in filters:
+            match = FILTER_PATTERN.match(expression)
+            if match is None:
+                raise QueryError(f"Invalid filter: {expression!r}")
+            column, operator, value = match.groups()
+            if column not in allowed:
+                raise QueryError(f"Cannot filter on column: {column}")
+            clauses.append(f'"{column}" {"=" if operator == "==" else operator} ?')
+            params.append(_parse_value(value, allowed[column]))
+        selected = ", ".join(["row"] + [f'"{column}"' for column in TABLES[table]])
+        sql = f"SELECT {selected} FROM {table} WHERE {' AND '.join(clauses)}"
+        if order:
+            column = order.lstrip("-")
+            if column not in allowed:
+                raise QueryError(f"Cannot order by column: {column}")
+            direction = "DESC" if order.startswith("-") else "ASC"
+            sql += f' ORDER BY "{column}" {direction}, row ASC'
+        else:
+            sql += " ORDER BY row ASC"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [int(limit), int(offset)]
+        with self._connect() as connection:
+            result = pd.read_sql_query(sql, connection, params=params)
+        result.insert(0, "run_id", run_id)
+        if table == "scores":
+            result.insert(1, "model_id", model_id)
+        LOGGER.info(
+            "store.query",
+            extra={"extra_data": {"table": table, "run_id": run_id, "rows": len(result)}},
+        )
+        return result
@@ -0,0 +1,20 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hei_seti.anomaly import FEATURE_COLUMNS
+
+
+@pytest.fixture
+def features_frame():
+    """Factory for synthetic feature tables: standard normal `FEATURE_COLUMNS` plus names."""
+
+    def make(rows: int = 60, *, seed: int = 0, shift: float = 0.0) -> pd.DataFrame:
+        rng = np.random.default_rng(seed)
+        frame = pd.DataFrame(
+            rng.normal(loc=shift, size=(rows, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS
+        )
+        frame["name"] = [f"s{seed}-{i}" for i in range(rows)]
+        return frame
+
+    return make
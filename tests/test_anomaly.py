@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+from joblib import dump, load
+from sklearn.ensemble import IsolationForest
+
+from hei_seti.anomaly import FEATURE_COLUMNS, AnomalyModel
+
+
+def test_ensemble_scores_mean_and_rank_variance(features_frame):
+    frame = features_frame(seed=1)
+    frame.loc[0, FEATURE_COLUMNS] = 25.0
+    model = AnomalyModel(random_state=3, n_estimators=20, ensemble_size=3, n_jobs=1)
+    model.fit(frame)
+
+    scored = model.score_ensemble(frame, chunk_size=16)
+    assert list(scored.columns) == ["anomaly", "anomaly_std", "rank_var"]
+    matrix = frame[FEATURE_COLUMNS].to_numpy()
+    forests = [
+        IsolationForest(random_state=seed, n_estimators=20).fit(matrix) for seed in (3, 4, 5)
+    ]
+    members = np.column_stack([-forest.score_samples(matrix) for forest in forests])
+    np.testing.assert_allclose(scored["anomaly"], members.mean(axis=1))
+    assert (scored["rank_var"] >= 0).all()
+    pd.testing.assert_series_equal(model.score(frame), scored["anomaly"])
+
+    ranked = model.rank(frame, top=5)
+    assert ranked.index[0] == 0
+    assert {"anomaly", "anomaly_std", "rank_var", "rank"}.issubset(ranked.columns)
+
+
+def test_single_forest_rank_has_no_ensemble_columns(features_frame):
+    model = AnomalyModel(random_state=0, n_estimators=20)
+    frame = features_frame(seed=1)
+    model.fit(frame)
+    ranked = model.rank(frame, top=3)
+    assert "rank_var" not in ranked.columns
+    with pytest.raises(RuntimeError):
+        AnomalyModel().score_ensemble(frame)
+
+
+def test_model_pickled_before_ensembles_still_loads(tmp_path, features_frame):
+    frame = features_frame(seed=1)
+    forest = IsolationForest(random_state=0, n_estimators=20).fit(frame[FEATURE_COLUMNS])
+    # Only the slots of the original single-forest model are set, as in old artifacts.
+    legacy = object.__new__(AnomalyModel)
+    for name, value in {"contamination": 0.05, "random_state": 0, "_model": forest}.items():
+        setattr(legacy, name, value)
+    path = tmp_path / "legacy.joblib"
+    dump(legacy, path)
+
+    model = load(path)
+    assert not model.is_ensemble
+    assert model.ensemble_size == 1
+    np.testing.assert_allclose(
+        model.score(frame), -forest.score_samples(frame[FEATURE_COLUMNS].to_numpy())
+    )
+    assert model.drift(frame) == {}
+    assert "rank_var" not in model.rank(frame, top=3).columns
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+from hei_seti.anomaly import AnomalyModel
+from hei_seti.barrow_sweep import BarrowSweep
+from hei_seti.heuristics import BarrowThresholds, KBarrowCalculator, barrow_levels
+
+BARROW_RANGES = {"hardness": (0, 10), "period": (1, 50), "bh_mass": (1, 40), "var_ratio": (1, 400)}
+
+
+def barrow_frame(features_frame, rows: int = 200) -> pd.DataFrame:
+    """Map the shared standard-normal features onto the ranges the Barrow rules probe."""
+
+    frame = features_frame(rows)
+    frame["flux"] = np.exp(frame["flux"])
+    for column, (low, high) in BARROW_RANGES.items():
+        frame[column] = low + (high - low) * norm.cdf(frame[column])
+    frame.loc[::7, "bh_mass"] = np.nan
+    return frame
+
+
+def test_vectorised_levels_match_row_rules(features_frame):
+    frame = barrow_frame(features_frame)
+    thresholds = BarrowThresholds(mass_bv=12, hardness_biv=7)
+    calc = KBarrowCalculator(thresholds=thresholds)
+    expected = frame.apply(calc.barrow, axis=1).to_numpy()
+    columns = {name: frame[name].to_numpy() for name in ("bh_mass", "var_ratio", "hardness")}
+    np.testing.assert_array_equal(barrow_levels(columns, thresholds), expected)
+    np.testing.assert_array_equal(calc.annotate(frame)["B"], expected)
+
+
+def test_sweep_matches_per_set_annotation_in_batches(features_frame):
+    frame = barrow_frame(features_frame)
+    grid = {"mass_bv": [5, 10, 30], "hardness_biv": [2, 5]}
+    sweep = BarrowSweep(grid=grid, max_elements=len(frame) * 2)
+    report = sweep.run(frame)
+    assert len(report) == 6
+    for record, thresholds in zip(report.to_dict("records"), sweep.threshold_sets()):
+        levels = KBarrowCalculator(thresholds=thresholds).annotate(frame)["B"]
+        assert record["n_BIV"] == int((levels == 4).sum())
+        assert record["n_BOMEGA"] == int((levels == 6).sum())
+    counts = report[["n_BIII", "n_BIV", "n_BV", "n_BOMEGA"]].sum(axis=1)
+    assert (counts == len(frame)).all()
+
+
+def test_sweep_reports_top_candidate_shift(features_frame):
+    frame = KBarrowCalculator().annotate(barrow_frame(features_frame))
+    model = AnomalyModel(contamination=0.1, random_state=0, n_estimators=20)
+    model.fit(frame)
+    report = BarrowSweep(grid={"hardness_biv": [5.0, 0.0]}, top_k=10).run(frame, model)
+    baseline = report.iloc[0]
+    assert baseline["n_changed"] == 0
+    assert baseline["topk_overlap"] == 1.0 and baseline["topk_entered"] == 0
+    assert report["topk_overlap"].between(0, 1).all()
+    assert report.iloc[1]["n_changed"] > 0
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+from types import SimpleNamespace
 
 import pandas as pd
 
@@ -13,9 +14,10 @@ class StubPipeline:
         self.featurize_args = None
         self.train_args = None
         self.score_args = None
+        self.sweep_args = None
 
-    def fetch(self, tables=None, output=None):
-        self.fetch_args = (tables, output)
+    def fetch(self, tables=None, output=None, refresh=False):
+        self.fetch_args = (tables, output, refresh)
         return pd.DataFrame({"value": [1, 2]})
 
     def featurize(self, input_path=None, output=None, dataframe=None):
@@ -30,6 +32,40 @@ class StubPipeline:
         self.score_args = (model_path, input_path, top, output)
         return pd.DataFrame({"K": [0.1], "B": [2], "anomaly": [0.5]})
 
+    def update(self, model_path=None, input_path=None, candidates=None, top=None, dataframe=None):
+        self.update_args = (model_path, input_path, candidates, top)
+        return SimpleNamespace(
+            scored=pd.DataFrame({"anomaly": [0.7]}),
+            candidates=pd.DataFrame({"anomaly": [0.7, 0.5]}),
+            drifted=["flux"],
+            insufficient=False,
+            retrain=True,
+        )
+
+    def neighbors(self, model_path=None, names=None, candidates=None, k=10):
+        self.neighbors_args = (model_path, names, candidates, k)
+        return pd.DataFrame({"query": ["A"], "neighbor": ["B"], "distance": [0.1], "rank": [1]})
+
+    def submit(self, stage, input_path=None, model_path=None, partitions=None):
+        self.submit_args = (stage, input_path, model_path, partitions)
+        return "job123"
+
+    def work(self, poll_interval=1.0, idle_timeout=None):
+        self.work_args = (poll_interval, idle_timeout)
+        return 4
+
+    def sweep(self, input_path=None, output=None, n_jobs=None, features=None):
+        self.sweep_args = (input_path, output, n_jobs)
+        return pd.DataFrame({"n_estimators": [100, 200], "topk_overlap": [0.9, 0.8]})
+
+    def query(self, table="scores", filters=(), order=None, limit=50, offset=0, run_id=None):
+        self.query_args = (table, list(filters), order, limit, offset, run_id)
+        return pd.DataFrame({"name": ["A", "B"], "anomaly": [0.9, 0.8]})
+
+    def barrow_sweep(self, model_path=None, input_path=None, output=None, features=None):
+        self.barrow_sweep_args = (model_path, input_path, output)
+        return pd.DataFrame({"mass_bv": [5.0, 10.0, 15.0]})
+
 
 def test_cli_fetch(monkeypatch, tmp_path, capsys):
     stub = StubPipeline()
@@ -39,7 +75,9 @@ def test_cli_fetch(monkeypatch, tmp_path, capsys):
     assert exit_code == 0
     captured = capsys.readouterr().out
     assert "Fetched" in captured
-    assert stub.fetch_args == (["a", "b"], str(output))
+    assert stub.fetch_args == (["a", "b"], str(output), False)
+    cli.main(["fetch", "--output", str(output), "--refresh"])
+    assert stub.fetch_args == (None, str(output), True)
 
 
 def test_cli_featurize_and_train(monkeypatch, tmp_path, capsys):
@@ -97,3 +135,89 @@ def test_cli_score_and_plot(monkeypatch, tmp_path, capsys):
     assert plot_path.exists()
     captured = capsys.readouterr().out
     assert "Plot saved" in captured
+
+
+def test_cli_sweep(monkeypatch, tmp_path, capsys):
+    stub = StubPipeline()
+    monkeypatch.setattr(cli, "_load_pipeline", lambda _: stub)
+    output = tmp_path / "sweep.csv"
+    exit_code = cli.main(
+        ["sweep", "--input", "features.parquet", "--output", str(output), "--n-jobs", "2"]
+    )
+    assert exit_code == 0
+    assert stub.sweep_args == ("features.parquet", str(output), 2)
+    assert "Swept 2 configurations" in capsys.readouterr().out
+
+
+def test_cli_query(monkeypatch, tmp_path, capsys):
+    stub = StubPipeline()
+    monkeypatch.setattr(cli, "_load_pipeline", lambda _: stub)
+    output = tmp_path / "query.csv"
+    exit_code = cli.main(
+        ["query", "--filter", "K > 0.5", "--filter", "B = 6", "--limit", "10"]
+        + ["--output", str(output)]
+    )
+    assert exit_code == 0
+    assert stub.query_args == ("scores", ["K > 0.5", "B = 6"], "-anomaly", 10, 0, None)
+    assert "Wrote 2 rows" in capsys.readouterr().out
+    cli.main(["query", "features", "--offset", "5"])
+    assert stub.query_args == ("features", [], None, 50, 5, None)
+
+
+def test_cli_barrow_sweep(monkeypatch, tmp_path, capsys):
+    stub = StubPipeline()
+    monkeypatch.setattr(cli, "_load_pipeline", lambda _: stub)
+    output = tmp_path / "barrow_sweep.csv"
+    exit_code = cli.main(["barrow-sweep", "--model", "m.joblib", "--output", str(output)])
+    assert exit_code == 0
+    assert stub.barrow_sweep_args == ("m.joblib", "data/features.parquet", str(output))
+    assert "Swept 3 Barrow threshold sets" in capsys.readouterr().out
+
+
+def test_cli_update_reports_drift(monkeypatch, capsys):
+    stub = StubPipeline()
+    monkeypatch.setattr(cli, "_load_pipeline", lambda _: stub)
+    exit_code = cli.main(["update", "--model", "m.joblib", "--input", "new.parquet", "--top", "5"])
+    assert exit_code == 0
+    assert stub.update_args == ("m.joblib", "new.parquet", "results/candidates.csv", 5)
+    out = capsys.readouterr().out
+    assert "Scored 1 new rows; 2 candidates" in out
+    assert "full retrain recommended (flux)" in out
+
+
+def test_cli_neighbors_writes_csv(monkeypatch, tmp_path, capsys):
+    stub = StubPipeline()
+    monkeypatch.setattr(cli, "_load_pipeline", lambda _: stub)
+    output = tmp_path / "neighbors.csv"
+    exit_code = cli.main(["neighbors", "--name", "A", "--k", "3", "--output", str(output)])
+    assert exit_code == 0
+    assert stub.neighbors_args == ("models/iforest.joblib", ["A"], None, 3)
+    assert pd.read_csv(output)["neighbor"].tolist() == ["B"]
+    assert "Wrote 1 neighbours" in capsys.readouterr().out
+
+
+def test_cli_cache_ls_and_clear(monkeypatch, tmp_path, capsys):
+    from hei_seti.stage_cache import StageCache
+
+    cache = StageCache(tmp_path / "cache")
+    artifact = tmp_path / "artifact.parquet"
+    artifact.write_bytes(b"data")
+    cache.store("featurize", "abc123", [artifact])
+    stub = StubPipeline()
+    stub.stage_cache = lambda: cache
+    monkeypatch.setattr(cli, "_load_pipeline", lambda _: stub)
+    assert cli.main(["cache", "ls"]) == 0
+    assert "1 entries, 4 bytes" in capsys.readouterr().out
+    assert cli.main(["cache", "clear"]) == 0
+    assert "Removed 1 entries" in capsys.readouterr().out
+
+
+def test_cli_submit_and_worker(monkeypatch, capsys):
+    stub = StubPipeline()
+    monkeypatch.setattr(cli, "_load_pipeline", lambda _: stub)
+    assert cli.main(["submit", "score", "--input", "f.parquet", "--model", "m.joblib"]) == 0
+    assert stub.submit_args == ("score", "f.parquet", "m.joblib", None)
+    assert capsys.readouterr().out.strip() == "job123"
+    assert cli.main(["worker", "--poll", "0.5", "--idle-timeout", "10"]) == 0
+    assert stub.work_args == (0.5, 10.0)
+    assert "Processed 4 tasks" in capsys.readouterr().out
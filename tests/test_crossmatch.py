@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from hei_seti.crossmatch import CrossMatcher
+
+
+def catalogues() -> pd.DataFrame:
+    offset = 2.0 / 3600.0  # 2 arcsec
+    return pd.DataFrame(
+        {
+            "name": ["Cyg X-1", "CYG X-1", "GX 339-4", "Close A", "Close B", "No position"],
+            "ra": [299.59, 299.59 + offset, 255.706, 10.0, 10.0 + offset, np.nan],
+            "dec": [35.20, 35.20, -48.79, 0.0, 0.0, np.nan],
+            "flux": [np.nan, 3e-8, 1e-9, 1.0, 2.0, 5.0],
+            "mbh": [21.2, np.nan, np.nan, np.nan, np.nan, np.nan],
+            "_source_table": ["xrbcatalog", "hmxbcat2", "lmxbcatalog", "t1", "t1", "t2"],
+        }
+    )
+
+
+def test_crossmatch_merges_counterparts_across_tables():
+    merged = CrossMatcher(radius_arcsec=5.0).merge(catalogues())
+    assert len(merged) == 5
+    cyg = merged.loc[merged["name"] == "Cyg X-1"].iloc[0]
+    assert cyg["flux"] == 3e-8
+    assert cyg["mbh"] == 21.2
+    assert cyg["_source_table"] == "hmxbcat2+xrbcatalog"
+    assert cyg["_n_matched"] == 2
+    assert set(merged.loc[merged["_source_table"] == "t1", "name"]) == {"Close A", "Close B"}
+    assert "No position" in set(merged["name"])
+
+
+def test_crossmatch_radius_and_within_table_option():
+    assert len(CrossMatcher(radius_arcsec=1.0).merge(catalogues())) == 6
+    merged = CrossMatcher(radius_arcsec=5.0, match_within_tables=True).merge(catalogues())
+    assert len(merged) == 4
+
+
+def test_crossmatch_handles_ra_wraparound():
+    df = pd.DataFrame(
+        {"ra": [359.9995, 0.0005], "dec": [10.0, 10.0], "_source_table": ["a", "b"]}
+    )
+    assert len(CrossMatcher(radius_arcsec=5.0).merge(df)) == 1
+
+
+def test_crossmatch_does_not_chain_rows_of_one_catalogue():
+    arcsec = 1.0 / 3600.0
+    df = pd.DataFrame(
+        {
+            "name": ["A1", "B", "A2"],
+            "ra": [10.0, 10.0 + 4 * arcsec, 10.0 + 8.5 * arcsec],
+            "dec": [0.0, 0.0, 0.0],
+            "_source_table": ["t1", "t2", "t1"],
+        }
+    )
+    merged = CrossMatcher(radius_arcsec=5.0).merge(df)
+    assert len(merged) == 2
+    assert set(merged["name"]) == {"A1", "A2"}
+    assert sorted(merged["_n_matched"]) == [1, 2]
+    assert sorted(merged["_source_table"]) == ["t1", "t1+t2"]
+
+
+def test_crossmatch_empty_catalogue():
+    merged = CrossMatcher().merge(pd.DataFrame({"ra": [], "dec": [], "_source_table": []}))
+    assert merged.empty
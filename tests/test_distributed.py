@@ -0,0 +1,149 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hei_seti.distributed import (
+    BROKERS,
+    DistributedJobError,
+    SQLiteBroker,
+    Worker,
+    split_parquet,
+)
+from hei_seti.pipeline import Pipeline
+
+
+def test_split_parquet_preserves_rows_and_offsets(tmp_path):
+    source = tmp_path / "raw.parquet"
+    pd.DataFrame({"value": np.arange(10)}).to_parquet(source)
+    descriptors = split_parquet(source, tmp_path / "parts", partitions=3)
+    assert [descriptor["start"] for descriptor in descriptors] == [0, 4, 8]
+    values = pd.concat(pd.read_parquet(d["input"]) for d in descriptors)["value"]
+    assert values.tolist() == list(range(10))
+
+
+def test_broker_retries_failures_and_reclaims_expired_leases(tmp_path):
+    broker = SQLiteBroker(tmp_path / "broker.sqlite", max_attempts=2)
+    broker.publish("job", "featurize", [{"n": 0}, {"n": 1}], {})
+
+    first = broker.claim("w1", lease_seconds=60)
+    second = broker.claim("w2", lease_seconds=0)
+    assert (first.partition, second.partition) == (0, 1)
+    broker.fail(first, "boom")
+    time.sleep(0.01)
+
+    retried = broker.claim("w3", lease_seconds=60)
+    stalled = broker.claim("w3", lease_seconds=60)
+    assert (retried.partition, retried.attempts) == (0, 2)
+    assert (stalled.partition, stalled.attempts) == (1, 2)
+    broker.fail(second, "stale worker")  # ignored: the task was re-claimed since
+    broker.fail(retried, "boom again")
+    broker.complete(stalled)
+    assert broker.claim("w4", lease_seconds=60) is None
+    assert broker.status("job") == {"failed": 1, "done": 1}
+
+
+def test_complete_rejects_a_stale_lease_holder(tmp_path):
+    broker = SQLiteBroker(tmp_path / "broker.sqlite", max_attempts=3)
+    broker.publish("job", "featurize", [{"n": 0}], {})
+    stale = broker.claim("w1", lease_seconds=0)
+    time.sleep(0.01)
+    current = broker.claim("w2", lease_seconds=60)
+
+    assert not broker.complete(stale)
+    assert broker.status("job") == {"running": 1}
+    assert broker.complete(current)
+    assert broker.status("job") == {"done": 1}
+
+
+def distributed_config(tmp_path) -> dict:
+    return {
+        "features": {
+            "flux_cols": ["flux"],
+            "hardness_cols": ["hardness"],
+            "period_cols": ["period"],
+            "bh_mass_cols": ["bh_mass"],
+        },
+        "anomaly": {"contamination": 0.1, "random_state": 0, "n_estimators": 20},
+        "distributed": {
+            "broker": str(tmp_path / "broker.sqlite"),
+            "work_dir": str(tmp_path / "work"),
+            "partitions": 3,
+        },
+    }
+
+
+def test_distributed_featurize_and_score_match_local_run(tmp_path):
+    rng = np.random.default_rng(0)
+    raw = pd.DataFrame(
+        {
+            "flux": rng.uniform(1e-10, 1e-8, 30),
+            "hardness": rng.uniform(0, 6, 30),
+            "period": rng.uniform(1, 50, 30),
+            "bh_mass": rng.uniform(3, 30, 30),
+            "name": [f"src{i}" for i in range(30)],
+        }
+    )
+    raw_path = tmp_path / "raw.parquet"
+    raw.to_parquet(raw_path)
+    pipeline = Pipeline(config=distributed_config(tmp_path))
+
+    job_id = pipeline.submit("featurize", input_path=raw_path)
+    with pytest.raises(DistributedJobError):
+        pipeline.collect(job_id, output=tmp_path / "features.parquet")
+    assert pipeline.work(poll_interval=0, idle_timeout=0) == 3
+    features = pipeline.collect(job_id, output=tmp_path / "features.parquet")
+    local = pipeline.featurize(dataframe=raw, output=tmp_path / "local.parquet")
+    pd.testing.assert_frame_equal(features, local)
+
+    model_path = pipeline.train(features=local, model_path=tmp_path / "model.joblib")
+    job_id = pipeline.submit(
+        "score", input_path=tmp_path / "features.parquet", model_path=model_path
+    )
+    pipeline.work(poll_interval=0, idle_timeout=0)
+    candidates = pipeline.collect(job_id, output=tmp_path / "candidates.csv", top=5)
+    expected = pipeline.score(model_path=model_path, features=local, top=5, output=None)
+    assert candidates["name"].tolist() == expected["name"].tolist()
+    np.testing.assert_allclose(candidates["anomaly"], expected["anomaly"])
+
+
+def test_worker_marks_failing_handler_for_retry(tmp_path):
+    broker = SQLiteBroker(tmp_path / "broker.sqlite", max_attempts=2)
+    broker.publish("job", "boom", [{}], {})
+
+    def explode(job, payload):
+        raise ValueError("bad partition")
+
+    worker = Worker(broker=broker, handlers={"boom": explode})
+    assert worker.run(poll_interval=0, idle_timeout=0) == 2
+    assert broker.status("job") == {"failed": 1}
+
+
+def test_collect_empty_score_job_returns_typed_frame(tmp_path):
+    features = pd.DataFrame({"name": pd.Series(dtype=str), "K": pd.Series(dtype=float)})
+    features_path = tmp_path / "features.parquet"
+    features.to_parquet(features_path)
+    pipeline = Pipeline(config=distributed_config(tmp_path))
+    job_id = pipeline.submit("score", input_path=features_path, model_path="model.joblib")
+
+    candidates = pipeline.collect(job_id, output=tmp_path / "candidates.csv")
+    assert candidates.empty
+    assert list(candidates.columns) == ["name", "K", "anomaly", "rank"]
+    assert candidates["anomaly"].dtype == float
+
+
+def test_pipeline_selects_broker_backend_from_config(tmp_path, monkeypatch):
+    config = distributed_config(tmp_path)
+    assert isinstance(Pipeline(config=config).broker(), SQLiteBroker)
+
+    class MemoryBroker(SQLiteBroker):
+        pass
+
+    monkeypatch.setitem(BROKERS, "memory", MemoryBroker)
+    config["distributed"]["backend"] = "memory"
+    assert isinstance(Pipeline(config=config).broker(), MemoryBroker)
+
+    config["distributed"]["backend"] = "redis"
+    with pytest.raises(ValueError, match="redis"):
+        Pipeline(config=config).broker()
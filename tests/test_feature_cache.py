@@ -0,0 +1,111 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from hei_seti import feature_cache
+from hei_seti.anomaly import FEATURE_COLUMNS, feature_matrix
+from hei_seti.feature_cache import FeatureCache, read_rows
+from hei_seti.pipeline import Pipeline
+
+
+def test_feature_cache_materializes_once_and_memory_maps(tmp_path, features_frame):
+    source = tmp_path / "features.parquet"
+    frame = features_frame(40)
+    frame.loc[0, "period"] = np.nan
+    frame.to_parquet(source)
+    cache = FeatureCache(tmp_path / "cache")
+
+    matrix = cache.load(source)
+    assert isinstance(matrix, np.memmap)
+    assert not matrix.flags.writeable
+    np.testing.assert_array_equal(matrix, feature_matrix(frame))
+    assert len(list((tmp_path / "cache").glob("*.npy"))) == 1
+
+    cache.load(source)
+    assert len(list((tmp_path / "cache").glob("*.npy"))) == 1
+
+    frame.assign(flux=frame["flux"] + 1).to_parquet(source)
+    cache.load(source)
+    assert len(list((tmp_path / "cache").glob("*.npy"))) == 2
+
+
+def test_pipeline_scores_from_cache_matches_uncached(tmp_path, features_frame):
+    source = tmp_path / "features.parquet"
+    frame = features_frame(40)
+    frame.to_parquet(source)
+    config = {"anomaly": {"contamination": 0.1, "random_state": 0}}
+    cached = Pipeline(config={**config, "cache": {"features_dir": str(tmp_path / "cache")}})
+    plain = Pipeline(config=config)
+
+    model_path = cached.train(input_path=source, model_path=tmp_path / "model.joblib")
+    from_cache = cached.score(model_path=model_path, input_path=source, top=5, output=None)
+    direct = plain.score(model_path=model_path, input_path=source, top=5, output=None)
+
+    assert list(from_cache["name"]) == list(direct["name"])
+    np.testing.assert_allclose(from_cache["anomaly"], direct["anomaly"])
+
+
+def test_feature_cache_hit_does_not_rehash_unchanged_source(tmp_path, monkeypatch, features_frame):
+    source = tmp_path / "features.parquet"
+    features_frame(40).to_parquet(source)
+    cache = FeatureCache(tmp_path / "cache")
+    cache.load(source)
+
+    calls = []
+    original = feature_cache.file_digest
+    monkeypatch.setattr(
+        feature_cache, "file_digest", lambda path: calls.append(path) or original(path)
+    )
+    cache.load(source)
+    assert calls == []
+
+    features_frame(rows=41).to_parquet(source)
+    cache.load(source)
+    assert len(calls) == 1
+
+
+def test_read_rows_decodes_requested_rows_in_order(tmp_path, features_frame):
+    source = tmp_path / "features.parquet"
+    frame = features_frame(rows=100)
+    pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), source, row_group_size=7)
+    order = np.array([99, 3, 50, 6, 7, 0])
+    picked = read_rows(source, order)
+    assert list(picked["name"]) == [f"s0-{i}" for i in order]
+
+
+def test_feature_cache_key_tracks_columns_and_code(tmp_path, monkeypatch, features_frame):
+    source = tmp_path / "features.parquet"
+    features_frame(40).to_parquet(source)
+    cache = FeatureCache(tmp_path / "cache")
+    first = cache.path_for(source)
+
+    monkeypatch.setattr(feature_cache, "FEATURE_COLUMNS", FEATURE_COLUMNS[:-1])
+    assert cache.path_for(source) != first
+    monkeypatch.undo()
+
+    monkeypatch.setattr(feature_cache, "code_version", lambda: "other")
+    assert cache.path_for(source) != first
+
+
+def test_feature_cache_evicts_least_recently_used_matrices(tmp_path, features_frame):
+    directory = tmp_path / "cache"
+    cache = FeatureCache(directory, max_bytes=1)
+    sources = []
+    for rows in (40, 41):
+        source = tmp_path / f"features{rows}.parquet"
+        features_frame(rows=rows).to_parquet(source)
+        sources.append(source)
+
+    matrix = cache.load(sources[0])
+    assert len(matrix) == 40
+    assert list(directory.glob("*.npy")) == []
+    assert list(directory.glob("stat/*.txt")) == []
+
+    cache.max_bytes = None
+    cache.load(sources[0])
+    cache.load(sources[1])
+    assert len(list(directory.glob("*.npy"))) == 2
+    newest = cache.path_for(sources[1])
+    evicted = cache.gc(newest.stat().st_size + 200)
+    assert newest.exists()
+    assert cache.path_for(sources[0]) in evicted
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hei_seti.lightcurves import (
+    LightCurveFeatures,
+    join_lightcurve_features,
+    lightcurve_files,
+    lomb_scargle,
+    synthetic_lightcurve,
+    write_synthetic_lightcurves,
+)
+
+
+def test_lomb_scargle_peaks_at_injected_frequency_in_any_block_size():
+    curve = synthetic_lightcurve(n_points=400, period=4.0, seed=1)
+    frequencies = np.linspace(0.01, 2.0, 800)
+    time, flux = curve["time"].to_numpy(), curve["flux"].to_numpy()
+    power = lomb_scargle(time, flux, frequencies)
+    blocked = lomb_scargle(time, flux, frequencies, max_elements=1000)
+    np.testing.assert_allclose(power, blocked)
+    assert 1.0 / frequencies[np.argmax(power)] == pytest.approx(4.0, rel=0.02)
+    assert power.max() <= 1.0 + 1e-9
+
+
+def test_extract_recovers_periods_and_streams_consistently(tmp_path):
+    periods = {"srcA": 3.3, "srcB": 12.0, "srcC": 0.7}
+    write_synthetic_lightcurves(tmp_path, periods, n_points=3000)
+    paths = lightcurve_files(tmp_path)
+    streamed = LightCurveFeatures(batch_size=500, max_points=1000, n_jobs=2).extract(paths)
+    whole = LightCurveFeatures(max_points=1000, n_jobs=1).extract(paths)
+    pd.testing.assert_frame_equal(streamed, whole)
+    recovered = streamed.set_index("name")["lc_period"]
+    for name, period in periods.items():
+        assert recovered[name] == pytest.approx(period, rel=0.03)
+    assert (streamed["lc_n_points"] == 3000).all()
+    assert (streamed["lc_var_ratio"] > 1).all()
+    assert (streamed["lc_excess_var"] > 0).all()
+
+
+def test_extract_reads_fits_tables_and_rejects_tableless_files(tmp_path):
+    fits = pytest.importorskip("astropy.io.fits")
+    curve = synthetic_lightcurve(n_points=2000, period=6.0, seed=2)
+    table = fits.BinTableHDU.from_columns(
+        [fits.Column(name=name, format="D", array=curve[name].to_numpy()) for name in curve]
+    )
+    primary = fits.PrimaryHDU()
+    primary.header["OBJECT"] = "GRS 1915+105"
+    fits.HDUList([primary, table]).writeto(tmp_path / "grs.fits")
+    fits.PrimaryHDU().writeto(tmp_path / "image.fits")
+
+    record = LightCurveFeatures(batch_size=300, max_points=1000).extract_one(tmp_path / "grs.fits")
+    assert record["name"] == "GRS 1915+105"
+    assert record["lc_n_points"] == 2000
+    assert record["lc_period"] == pytest.approx(6.0, rel=0.03)
+    with pytest.raises(ValueError, match="image.fits"):
+        LightCurveFeatures().extract_one(tmp_path / "image.fits")
+
+
+def test_join_fills_missing_catalogue_values():
+    features = pd.DataFrame(
+        {"var_ratio": [np.nan, 7.0, np.nan], "period": [np.nan, 1.0, 2.0], "name": ["a", "b", "z"]}
+    )
+    lightcurves = pd.DataFrame(
+        {"name": ["a", "b"], "lc_var_ratio": [3.0, 4.0], "lc_period": [5.0, 6.0]}
+    )
+    joined = join_lightcurve_features(features, lightcurves)
+    assert list(joined["var_ratio"].fillna(-1)) == [3.0, 7.0, -1]
+    assert list(joined["period"]) == [5.0, 1.0, 2.0]
+    assert joined["lc_std"].isna().all()
@@ -0,0 +1,88 @@
+import pandas as pd
+
+from hei_seti.anomaly import FEATURE_COLUMNS, AnomalyModel
+from hei_seti.online import OnlineScorer, merge_candidates
+from hei_seti.pipeline import Pipeline
+
+
+def test_merge_candidates_replaces_duplicates_and_keeps_top():
+    existing = pd.DataFrame(
+        {"name": ["a", "b", "c"], "anomaly": [0.9, 0.8, 0.7], "rank": [1, 2, 3]}
+    )
+    new = pd.DataFrame({"name": ["b", "d"], "anomaly": [0.95, 0.1]})
+    merged = merge_candidates(existing, new, top=3)
+    assert list(merged["name"]) == ["b", "a", "c"]
+    assert list(merged["rank"]) == [1, 2, 3]
+
+
+def test_online_scorer_flags_drift(features_frame):
+    reference = features_frame(200)
+    model = AnomalyModel(random_state=0, n_estimators=20)
+    model.fit(reference)
+    scorer = OnlineScorer(model=model, top=10, drift_threshold=0.25)
+
+    steady = scorer.update(features_frame(200, seed=1), existing=None)
+    assert not steady.retrain
+    assert len(steady.candidates) == 10
+
+    shifted = scorer.update(features_frame(200, shift=3.0, seed=2), existing=steady.candidates)
+    assert shifted.retrain
+    assert set(shifted.drifted) == set(FEATURE_COLUMNS)
+
+
+def test_small_batches_from_reference_do_not_retrain(features_frame):
+    model = AnomalyModel(random_state=0, n_estimators=20)
+    model.fit(features_frame(5000))
+
+    for rows in (1, 5, 20):
+        result = OnlineScorer(model=model).update(features_frame(rows, seed=rows), None)
+        assert result.insufficient
+        assert not result.retrain
+
+    checked = OnlineScorer(model=model, min_rows=10).update(features_frame(20, seed=7), None)
+    assert not checked.insufficient
+    assert not checked.retrain
+    assert max(checked.drift.values()) < 1.0
+
+
+def test_online_scorer_keeps_ensemble_columns(features_frame):
+    model = AnomalyModel(random_state=0, n_estimators=20, ensemble_size=2, n_jobs=1)
+    model.fit(features_frame(200))
+    result = OnlineScorer(model=model, top=5).update(features_frame(20, seed=3), None)
+    assert {"anomaly", "anomaly_std", "rank_var"}.issubset(result.candidates.columns)
+
+
+def test_pipeline_update_merges_into_candidates_csv(tmp_path):
+    config = {
+        "features": {
+            "flux_cols": ["flux"],
+            "hardness_cols": ["hardness"],
+            "period_cols": ["period"],
+            "bh_mass_cols": ["bh_mass"],
+        },
+        "anomaly": {"contamination": 0.2, "random_state": 0, "n_estimators": 20},
+        "online": {"top": 3},
+    }
+    raw = pd.DataFrame(
+        {
+            "flux": [1e-9, 2e-9, 3e-9, 4e-9],
+            "hardness": [1.0, 2.0, 1.5, 3.5],
+            "period": [10, 20, 30, 40],
+            "bh_mass": [5, 8, 15, 30],
+            "name": ["A", "B", "C", "D"],
+        }
+    )
+    pipeline = Pipeline(config=config)
+    features = pipeline.featurize(dataframe=raw, output=tmp_path / "features.parquet")
+    model_path = pipeline.train(features=features, model_path=tmp_path / "model.joblib")
+    candidates = tmp_path / "candidates.csv"
+    pipeline.score(model_path=model_path, features=features, top=3, output=candidates)
+
+    new_raw = pd.DataFrame(
+        {"flux": [9e-7], "hardness": [40.0], "period": [1], "bh_mass": [90], "name": ["E"]}
+    )
+    result = pipeline.update(model_path=model_path, dataframe=new_raw, candidates=candidates)
+    written = pd.read_csv(candidates)
+    assert len(written) == 3
+    assert written.loc[0, "name"] == "E"
+    assert list(result.candidates["name"]) == list(written["name"])
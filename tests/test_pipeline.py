@@ -1,8 +1,11 @@
+import sqlite3
 from pathlib import Path
 
 import pandas as pd
+import pytest
 
 from hei_seti.pipeline import Pipeline
+from hei_seti.store import TABLES
 
 
 def sample_config(tmp_path: Path) -> dict:
@@ -52,3 +55,203 @@ def test_pipeline_training_and_scoring(tmp_path):
     assert output_path.exists()
     assert len(scored) == 2
     assert {"anomaly", "rank"}.issubset(scored.columns)
+
+
+def test_pipeline_crossmatch_deduplicates_before_featurize(tmp_path):
+    pipeline = Pipeline(config={**sample_config(tmp_path), "crossmatch": {"radius_arcsec": 5.0}})
+    raw = raw_dataframe().assign(
+        ra=[10.0, 10.0 + 1 / 3600, 50.0, 80.0],
+        dec=[5.0, 5.0, -5.0, 20.0],
+        _source_table=["t1", "t2", "t1", "t2"],
+    )
+    merged = pipeline.crossmatch(dataframe=raw, output=tmp_path / "matched.parquet")
+    assert len(merged) == 3
+    assert merged.loc[0, "_source_table"] == "t1+t2"
+    feats = pipeline.featurize(dataframe=merged, output=tmp_path / "features.parquet")
+    assert len(feats) == 3
+
+
+def test_pipeline_train_saves_similarity_index(tmp_path):
+    config = {**sample_config(tmp_path), "similarity": {"enabled": True}}
+    pipeline = Pipeline(config=config)
+    feats = pipeline.featurize(dataframe=raw_dataframe(), output=tmp_path / "features.parquet")
+    model_path = pipeline.train(features=feats, model_path=tmp_path / "model.joblib")
+    assert (tmp_path / "model.neighbors.joblib").exists()
+    neighbours = pipeline.neighbors(model_path=model_path, names=["A", "D"], k=2)
+    assert len(neighbours) == 4
+    assert "A" not in set(neighbours.loc[neighbours["query"] == "A", "neighbor"])
+
+
+def test_pipeline_uncertainty_uses_raw_distance_columns(tmp_path: Path):
+    config = sample_config(tmp_path)
+    config["heuristics"]["distance_col"] = "distance_kpc"
+    config["uncertainty"] = {"n_samples": 200, "chunk_size": 3}
+    raw = raw_dataframe()
+    raw["distance_kpc"] = [1.0, 2.0, None, 4.0]
+    pipeline = Pipeline(config=config)
+    output = tmp_path / "uncertainty.parquet"
+    result = pipeline.uncertainty(dataframe=raw, output=output)
+    assert output.exists()
+    assert list(result["name"]) == ["A", "B", "C", "D"]
+    assert result[["K", "K_mean", "K_p16", "K_p84"]].notna().all().all()
+    assert (result["K_p16"] <= result["K"]).all() and (result["K"] <= result["K_p84"]).all()
+    assert not result["distance_from_prior"].any()
+
+    features = pipeline.featurize(dataframe=raw, output=tmp_path / "features.parquet")
+    pd.testing.assert_series_equal(result["K"], features["K"])
+    fallback = Pipeline(config=sample_config(tmp_path)).build_features(raw)
+    known = raw["distance_kpc"].notna()
+    assert (features.loc[known, "K"] != fallback.loc[known, "K"]).all()
+    assert features.loc[~known, "K"].equals(fallback.loc[~known, "K"])
+
+
+def test_featurize_keeps_distance_column_for_k(tmp_path: Path):
+    config = sample_config(tmp_path)
+    config["heuristics"]["distance_col"] = "distance_kpc"
+    raw = raw_dataframe()
+    raw["distance_kpc"] = [1.0, 2.0, None, "4.0"]
+    features = Pipeline(config=config).featurize(
+        dataframe=raw, output=tmp_path / "features.parquet"
+    )
+    derived = ["flux", "hardness", "period", "bh_mass", "var_ratio", "distance_kpc", "K", "B"]
+    assert list(features.columns) == derived + ["name", "_source_table"]
+    assert features["distance_kpc"].dtype == float
+    assert features["K"].to_numpy() == pytest.approx([2.807791, 2.898100, 0.247712, 2.988409])
+
+    plain = Pipeline(config=sample_config(tmp_path)).build_features(raw_dataframe())
+    assert "distance_kpc" not in plain
+    assert plain.loc[2, "K"] == pytest.approx(0.247712)
+
+
+def test_pipeline_barrow_thresholds_and_sweep(tmp_path: Path):
+    config = sample_config(tmp_path)
+    config["heuristics"]["barrow_thresholds"] = {"hardness_biv": 3.0}
+    config["barrow_sweep"] = {"grid": {"hardness_biv": [3.0, 10.0]}, "top_k": 2}
+    pipeline = Pipeline(config=config)
+    features_path = tmp_path / "features.parquet"
+    features = pipeline.featurize(dataframe=raw_dataframe(), output=features_path)
+    assert list(features["B"]) == [3, 3, 5, 4]
+    model_path = pipeline.train(features=features, model_path=tmp_path / "model.joblib")
+    report = pipeline.barrow_sweep(
+        model_path=model_path, input_path=features_path, output=tmp_path / "sweep.csv"
+    )
+    assert list(report["hardness_biv"]) == [3.0, 10.0]
+    assert list(report["n_changed"]) == [0, 1]
+    assert report.loc[0, "topk_overlap"] == 1.0
+
+
+def test_pipeline_joins_lightcurve_features(tmp_path: Path):
+    from hei_seti.lightcurves import write_synthetic_lightcurves
+
+    config = sample_config(tmp_path)
+    config["lightcurves"] = {
+        "dir": str(tmp_path / "lightcurves"),
+        "output": str(tmp_path / "lc.parquet"),
+        "n_jobs": 1,
+    }
+    write_synthetic_lightcurves(tmp_path / "lightcurves", {"A": 2.0, "C": 8.0}, n_points=500)
+    pipeline = Pipeline(config=config)
+    table = pipeline.lightcurves()
+    assert sorted(table["name"]) == ["A", "C"]
+    plain = pipeline.featurize(dataframe=raw_dataframe(), output=tmp_path / "plain.parquet")
+    assert "lc_period" not in plain
+
+    config["lightcurves"]["enabled"] = True
+    features = pipeline.featurize(dataframe=raw_dataframe(), output=tmp_path / "features.parquet")
+    assert features["lc_period"].notna().tolist() == [True, False, True, False]
+    assert features.loc[0, "var_ratio"] == features.loc[0, "lc_var_ratio"]
+
+    (tmp_path / "lc.parquet").unlink()
+    with pytest.raises(FileNotFoundError):
+        pipeline.featurize(dataframe=raw_dataframe(), output=tmp_path / "features.parquet")
+
+
+def test_pipeline_profile_writes_json_report(tmp_path: Path):
+    import json
+
+    raw_path = tmp_path / "raw.parquet"
+    raw_dataframe().to_parquet(raw_path)
+    pipeline = Pipeline(config=sample_config(tmp_path))
+    report = pipeline.profile(input_path=raw_path, output=tmp_path / "profile.json")
+    saved = json.loads((tmp_path / "profile.json").read_text())
+    assert saved["run_id"] == report["run_id"]
+    assert saved["tables"]["t1"]["sources"]["flux"] == {"flux": 4}
+    assert saved["tables"]["__all__"]["columns"]["bh_mass"]["max"] == 30
+
+
+def test_pipeline_writes_features_and_full_scores_to_store(tmp_path: Path):
+    config = sample_config(tmp_path)
+    config["store"] = {"path": str(tmp_path / "results.sqlite")}
+    pipeline = Pipeline(config=config)
+    raw_path = tmp_path / "raw.parquet"
+    raw_dataframe().to_parquet(raw_path)
+    features_path = tmp_path / "features.parquet"
+    pipeline.featurize(input_path=raw_path, output=features_path)
+    model_path = pipeline.train(input_path=features_path, model_path=tmp_path / "model.joblib")
+    top = pipeline.score(
+        model_path=model_path, input_path=features_path, top=2, output=tmp_path / "top.csv"
+    )
+    stored = pipeline.query("scores", order="-anomaly", limit=None)
+    assert len(stored) == 4
+    assert stored["name"].head(2).tolist() == top["name"].astype(str).tolist()
+    runs = pipeline.results_store().runs()
+    assert set(runs["kind"]) == {"features", "scores"}
+    assert runs.loc[runs["kind"] == "scores", "model_id"].str.len().iloc[0] == 64
+    heavy = pipeline.query("features", filters=["bh_mass >= 15"], order="name")
+    assert heavy["name"].tolist() == ["C", "D"]
+
+
+def test_store_is_refilled_when_stages_are_served_from_cache(tmp_path: Path):
+    config = sample_config(tmp_path)
+    config["stage_cache"] = {"dir": str(tmp_path / "cache")}
+    config["store"] = {"path": str(tmp_path / "first.sqlite")}
+    pipeline = Pipeline(config=config)
+    raw_path = tmp_path / "raw.parquet"
+    raw_dataframe().to_parquet(raw_path)
+    features_path = tmp_path / "features.parquet"
+    model_path = tmp_path / "model.joblib"
+    output = tmp_path / "top.csv"
+
+    pipeline.featurize(input_path=raw_path, output=features_path)
+    pipeline.train(input_path=features_path, model_path=model_path)
+    first = pipeline.score(model_path=model_path, input_path=features_path, top=2, output=output)
+
+    config["store"]["path"] = str(tmp_path / "second.sqlite")
+    pipeline.featurize(input_path=raw_path, output=features_path)
+    second = pipeline.score(model_path=model_path, input_path=features_path, top=2, output=output)
+    assert len(pipeline.stage_cache().entries()) == 3
+    # The new store lacks this score run, so it is scored afresh rather than restored.
+    pd.testing.assert_frame_equal(first, second)
+    assert len(pipeline.query("features", limit=None)) == 4
+    stored = pipeline.query("scores", order="-anomaly", limit=None)
+    assert stored["name"].head(2).tolist() == second["name"].astype(str).tolist()
+
+
+def stored_rows(path: Path) -> list[int]:
+    with sqlite3.connect(path) as connection:
+        return [connection.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in TABLES]
+
+
+def test_rerunning_unchanged_stages_does_not_duplicate_store_runs(tmp_path: Path):
+    config = sample_config(tmp_path)
+    config["stage_cache"] = {"dir": str(tmp_path / "cache")}
+    config["store"] = {"path": str(tmp_path / "results.sqlite")}
+    pipeline = Pipeline(config=config)
+    raw_path = tmp_path / "raw.parquet"
+    raw_dataframe().to_parquet(raw_path)
+    features_path = tmp_path / "features.parquet"
+    model_path = tmp_path / "model.joblib"
+    output = tmp_path / "top.csv"
+
+    pipeline.featurize(input_path=raw_path, output=features_path)
+    pipeline.train(input_path=features_path, model_path=model_path)
+    pipeline.score(model_path=model_path, input_path=features_path, top=2, output=output)
+    store_path = tmp_path / "results.sqlite"
+    assert stored_rows(store_path) == [4, 4]
+
+    pipeline.featurize(input_path=raw_path, output=features_path)
+    pipeline.score(model_path=model_path, input_path=features_path, top=2, output=output)
+    pipeline.score(model_path=model_path, input_path=features_path, top=3, output=output)
+    assert sorted(pipeline.results_store().runs()["kind"]) == ["features", "scores"]
+    assert stored_rows(store_path) == [4, 4]
+    assert not list(tmp_path.glob("*.scores.parquet"))
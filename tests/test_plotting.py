@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from hei_seti.plotting import kb_histogram, plot_kb_space
+
+
+def write_features(path, rows: int = 1000):
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame(
+        {
+            "K": rng.normal(0.5, 0.2, size=rows),
+            "B": rng.integers(3, 7, size=rows),
+            "flux": rng.normal(size=rows),
+        }
+    )
+    frame.loc[0, "K"] = np.nan
+    frame.to_parquet(path, row_group_size=128)
+    return frame
+
+
+def test_kb_histogram_counts_every_finite_row_in_batches(tmp_path):
+    path = tmp_path / "features.parquet"
+    frame = write_features(path)
+    histogram = kb_histogram(path, k_bins=20, batch_size=100)
+    assert histogram.counts.shape == (6, 20)
+    assert histogram.total == len(frame) - 1
+    assert histogram.k_edges[0] == frame["K"].min()
+    assert histogram.k_edges[-1] == frame["K"].max()
+    per_level = histogram.counts.sum(axis=1)
+    expected = frame.dropna(subset=["K"])["B"].value_counts().reindex(range(1, 7), fill_value=0)
+    np.testing.assert_array_equal(per_level, expected.to_numpy())
+
+
+def test_plot_kb_space_renders_with_candidates(tmp_path):
+    path = tmp_path / "features.parquet"
+    write_features(path)
+    candidates = tmp_path / "candidates.csv"
+    pd.DataFrame({"K": [0.9], "B": [6], "anomaly": [0.7]}).to_csv(candidates, index=False)
+    output = plot_kb_space(path, tmp_path / "kb.png", candidates_path=candidates, k_bins=32)
+    assert output.exists()
+    assert output.stat().st_size > 0
@@ -0,0 +1,84 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hei_seti import profiling
+from hei_seti.profiling import Profile, Profiler, QuantileSketch, coalesce_with_source
+
+
+def test_sketch_quantiles_are_relative_accurate_and_mergeable():
+    values = np.random.default_rng(0).lognormal(0, 3, 20000) * np.where(np.arange(20000) % 4, 1, -1)
+    whole = QuantileSketch(relative_accuracy=0.01)
+    whole.update(values)
+    left, right = QuantileSketch(relative_accuracy=0.01), QuantileSketch(relative_accuracy=0.01)
+    left.update(values[:7000])
+    right.update(values[7000:])
+    left.merge(right)
+    assert left.to_dict() == whole.to_dict()
+    qs = [0.01, 0.1, 0.5, 0.9, 0.99]
+    expected = np.quantile(values, qs, method="lower")
+    np.testing.assert_allclose(whole.quantiles(qs), expected, rtol=0.03)
+    restored = QuantileSketch.from_dict(json.loads(json.dumps(whole.to_dict())))
+    assert restored.quantiles(qs) == whole.quantiles(qs)
+
+
+def test_coalesce_reports_supplying_column():
+    frame = pd.DataFrame({"flux": [1.0, None, None], "fx": [5.0, 2.0, None]})
+    values, sources = coalesce_with_source(frame, ["flux", "fx", "missing"])
+    assert values.tolist()[:2] == [1.0, 2.0] and np.isnan(values.iloc[2])
+    assert sources.tolist() == ["flux", "fx", "<none>"]
+
+
+def test_profiler_streams_and_merges_shards(tmp_path):
+    rng = np.random.default_rng(1)
+    frame = pd.DataFrame(
+        {
+            "flux": np.where(rng.random(3000) < 0.5, np.nan, rng.lognormal(size=3000)),
+            "fx": rng.lognormal(size=3000),
+            "flux_max": rng.uniform(2, 4, 3000),
+            "flux_min": rng.uniform(1, 2, 3000),
+            "name": [f"s{i}" for i in range(3000)],
+            "_source_table": np.repeat(["t1", "t2", "t3"], 1000),
+        }
+    )
+    path = tmp_path / "raw.parquet"
+    frame.to_parquet(path, row_group_size=500)
+    profiler = Profiler(feature_sources={"flux": ["flux", "fx"]})
+    serial = profiler.run(path, batch_size=256).report()
+    sharded = profiler.run(path, batch_size=256, n_jobs=2).report()
+    assert serial == sharded
+    merged = Profile.from_dict(profiler.profile_frame(frame).to_dict()).report()
+    assert merged == serial
+
+    overall = serial["__all__"]
+    assert overall["rows"] == 3000
+    flux = overall["columns"]["flux"]
+    assert flux["nulls"] == int(frame["flux"].isna().sum())
+    assert flux["min"] == pytest.approx(frame["flux"].min())
+    assert overall["sources"]["flux"] == {
+        "flux": int(frame["flux"].notna().sum()),
+        "fx": int(frame["flux"].isna().sum()),
+    }
+    assert overall["columns"]["feature:flux"]["nulls"] == 0
+    assert "feature:var_ratio" in overall["columns"]
+    assert overall["columns"]["name"] == {"rows": 3000, "nulls": 0, "coverage": 1.0}
+    assert serial["t2"]["rows"] == 1000
+
+
+def test_profiler_caps_negative_n_jobs_at_cpu_count(tmp_path, monkeypatch):
+    path = tmp_path / "raw.parquet"
+    pd.DataFrame({"fx": np.arange(600.0)}).to_parquet(path, row_group_size=10)
+    monkeypatch.setattr("hei_seti.profiling.effective_n_jobs", lambda n_jobs: 3)
+    used = []
+    original = profiling.Parallel
+
+    def recording_parallel(n_jobs, **kwargs):
+        used.append(n_jobs)
+        return original(n_jobs=1, **kwargs)
+
+    monkeypatch.setattr(profiling, "Parallel", recording_parallel)
+    profile = Profiler().run(path, batch_size=64, n_jobs=-1)
+    assert used == [3]
+    assert profile.report()["__all__"]["rows"] == 600
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from hei_seti.similarity import SimilarityIndex
+
+
+def build_index() -> SimilarityIndex:
+    matrix = np.array(
+        [
+            [0.0, 0.0, 10.0],
+            [0.1, 0.0, 10.0],
+            [0.2, 0.1, 10.0],
+            [5.0, 5.0, 10.0],
+            [5.1, 5.0, 10.0],
+        ]
+    )
+    return SimilarityIndex.build(matrix, ["a", "b", "c", "d", "e"])
+
+
+def test_neighbors_batch_excludes_self_and_orders_by_distance():
+    index = build_index()
+    result = index.neighbors(["a", "d"], k=2)
+    assert list(result["query"]) == ["a", "a", "d", "d"]
+    assert list(result["neighbor"]) == ["b", "c", "e", "c"]
+    assert list(result["rank"]) == [1, 2, 1, 2]
+    assert (result.groupby("query")["distance"].diff().dropna() >= 0).all()
+    with pytest.raises(KeyError):
+        index.neighbors(["zzz"])
+
+
+def test_index_round_trips_next_to_model(tmp_path):
+    index = build_index()
+    path = SimilarityIndex.path_for(tmp_path / "iforest.joblib")
+    assert path.name == "iforest.neighbors.joblib"
+    restored = SimilarityIndex.load(index.save(path))
+    distances, rows = restored.query(np.array([0.05, 0.0, 10.0]), k=2)
+    assert set(rows[0]) == {0, 1}
+    assert distances.shape == (1, 2)
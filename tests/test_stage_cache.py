@@ -0,0 +1,138 @@
+import pandas as pd
+
+from hei_seti import feature_cache
+from hei_seti.pipeline import Pipeline
+from hei_seti.stage_cache import StageCache
+
+
+def test_stage_cache_key_tracks_inputs_and_config(tmp_path):
+    source = tmp_path / "in.txt"
+    source.write_text("a")
+    cache = StageCache(tmp_path / "cache")
+    base = cache.key("featurize", [source], {"features": {"flux_cols": ["flux"]}})
+    assert base == cache.key("featurize", [source], {"features": {"flux_cols": ["flux"]}})
+    assert base != cache.key("featurize", [source], {"features": {"flux_cols": ["fx"]}})
+    source.write_text("b")
+    assert base != cache.key("featurize", [source], {"features": {"flux_cols": ["flux"]}})
+
+
+def test_stage_cache_key_hashes_unchanged_inputs_once(tmp_path, monkeypatch):
+    source = tmp_path / "in.txt"
+    source.write_text("a")
+    calls = []
+    original = feature_cache.file_digest
+    monkeypatch.setattr(
+        feature_cache, "file_digest", lambda path: calls.append(path) or original(path)
+    )
+    cache = StageCache(tmp_path / "cache")
+    first = cache.key("featurize", [source])
+    assert StageCache(tmp_path / "cache").key("featurize", [source]) == first
+    assert len(calls) == 1
+
+    source.write_text("abc")
+    assert cache.key("featurize", [source]) != first
+    assert len(calls) == 2
+
+
+def test_stage_cache_restore_and_lru_eviction(tmp_path):
+    cache = StageCache(tmp_path / "cache")
+    outputs = []
+    for index in range(3):
+        output = tmp_path / f"out{index}.bin"
+        output.write_bytes(b"x" * 100)
+        cache.store("stage", f"key{index}", [output])
+        outputs.append(output)
+    outputs[0].unlink()
+    assert cache.restore("stage", "key0", [outputs[0]])
+    assert outputs[0].read_bytes() == b"x" * 100
+    assert not cache.restore("stage", "missing", [outputs[0]])
+
+    evicted = cache.gc(max_bytes=200)
+    assert [entry["key"] for entry in evicted] == ["key1"]
+    assert {entry["key"] for entry in cache.entries()} == {"key0", "key2"}
+    assert cache.clear() == 2
+
+
+def test_pipeline_skips_unchanged_featurize(tmp_path, monkeypatch):
+    config = {
+        "features": {
+            "flux_cols": ["flux"],
+            "hardness_cols": [],
+            "period_cols": [],
+            "bh_mass_cols": [],
+        },
+        "stage_cache": {"dir": str(tmp_path / "cache")},
+    }
+    raw_path = tmp_path / "raw.parquet"
+    pd.DataFrame({"flux": [1e-9, 2e-9], "name": ["A", "B"]}).to_parquet(raw_path)
+    pipeline = Pipeline(config=config)
+    first = pipeline.featurize(input_path=raw_path, output=tmp_path / "features.parquet")
+
+    def fail(_self, _dataframe):
+        raise AssertionError("featurize should have been served from the stage cache")
+
+    monkeypatch.setattr(Pipeline, "build_features", fail)
+    second = pipeline.featurize(input_path=raw_path, output=tmp_path / "copy.parquet")
+    pd.testing.assert_frame_equal(first, second)
+
+    pipeline.config["features"]["flux_cols"] = ["fx", "flux"]
+    monkeypatch.undo()
+    pipeline.featurize(input_path=raw_path, output=tmp_path / "features.parquet")
+    assert len(pipeline.stage_cache().entries()) == 2
+
+
+def test_fetch_refresh_bypasses_stage_cache(tmp_path, monkeypatch):
+    calls = []
+
+    class StubFetcher:
+        def __init__(self, maxrec):
+            pass
+
+        def fetch_many(self, tables):
+            calls.append(tables)
+            return pd.DataFrame({"name": [f"S{len(calls)}"], "_source_table": tables[:1]})
+
+        def persist_dataframe(self, dataframe, output):
+            dataframe.to_parquet(output)
+
+    monkeypatch.setattr("hei_seti.pipeline.HeasarcFetcher", StubFetcher)
+    pipeline = Pipeline(config={"stage_cache": {"dir": str(tmp_path / "cache")}})
+    output = tmp_path / "raw.parquet"
+    assert list(pipeline.fetch(["t1"], output)["name"]) == ["S1"]
+    assert list(pipeline.fetch(["t1"], output)["name"]) == ["S1"]
+    assert list(pipeline.fetch(["t1"], output, refresh=True)["name"]) == ["S2"]
+    assert list(pipeline.fetch(["t1"], output)["name"]) == ["S2"]
+    assert len(calls) == 2
+
+
+def test_score_cache_ignores_training_only_settings(tmp_path, monkeypatch):
+    frame = pd.DataFrame(
+        {
+            "flux": [1.0, 2.0, 3.0, 50.0],
+            "hardness": [1.0, 1.0, 2.0, 9.0],
+            "period": [1.0, 2.0, 3.0, 4.0],
+            "bh_mass": [5.0, 6.0, 7.0, 90.0],
+            "var_ratio": [1.0, 1.0, 1.0, 1.0],
+            "K": [0.1, 0.2, 0.3, 2.0],
+            "B": [3, 3, 3, 5],
+            "name": ["A", "B", "C", "D"],
+        }
+    )
+    features = tmp_path / "features.parquet"
+    frame.to_parquet(features)
+    config = {
+        "anomaly": {"random_state": 0, "n_estimators": 20},
+        "stage_cache": {"dir": str(tmp_path / "cache")},
+    }
+    pipeline = Pipeline(config=config)
+    model_path = pipeline.train(input_path=features, model_path=tmp_path / "model.joblib")
+    output = tmp_path / "candidates.csv"
+    first = pipeline.score(model_path=model_path, input_path=features, top=2, output=output)
+
+    def fail(_path):
+        raise AssertionError("score should have been served from the stage cache")
+
+    monkeypatch.setattr("hei_seti.pipeline.load", fail)
+    pipeline.config["anomaly"]["n_estimators"] = 50
+    second = pipeline.score(model_path=model_path, input_path=features, top=2, output=output)
+    pd.testing.assert_frame_equal(first.reset_index(drop=True), second)
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from hei_seti.store import QueryError, ResultsStore
+
+
+def scores_frame(rows: int = 100) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "name": [f"src{i}" for i in range(rows)],
+            "_source_table": np.where(np.arange(rows) % 2, "xrb", "lmxb"),
+            "K": rng.uniform(0, 1, rows),
+            "B": rng.integers(3, 7, rows),
+            "anomaly": rng.normal(size=rows),
+        }
+    )
+
+
+def test_store_writes_runs_in_batches_and_queries_latest(tmp_path):
+    store = ResultsStore(tmp_path / "results.sqlite", batch_size=7)
+    frame = scores_frame()
+    first = store.write_scores(frame, model_id="m1")
+    frame.loc[0, "anomaly"] = np.nan
+    second = store.write_scores(frame, model_id="m2", input_path="features.parquet")
+    runs = store.runs("scores")
+    assert list(runs["run_id"]) == [second, first]
+    assert list(runs["rows"]) == [100, 100]
+
+    result = store.query(filters=["K > 0.5", "B = 6"], order="-anomaly", limit=None)
+    expected = frame[(frame["K"] > 0.5) & (frame["B"] == 6)].sort_values(
+        "anomaly", ascending=False, na_position="last"
+    )
+    assert list(result["name"]) == list(expected["name"])
+    assert set(result["model_id"]) == {"m2"}
+    assert result["anomaly_std"].isna().all()
+
+    page = store.query(order="-anomaly", limit=10, offset=10, run_id=first)
+    ordered = scores_frame().sort_values("anomaly", ascending=False)["name"].tolist()
+    assert page["name"].tolist() == ordered[10:20]
+    assert store.query(filters=["_source_table = 'xrb'"], limit=None)["row"].tolist() == list(
+        range(1, 100, 2)
+    )
+
+
+def test_store_rejects_non_whitelisted_queries(tmp_path):
+    store = ResultsStore(tmp_path / "results.sqlite")
+    store.write_features(scores_frame().drop(columns="anomaly"))
+    with pytest.raises(QueryError):
+        store.query("features", filters=["anomaly > 0"])
+    with pytest.raises(QueryError):
+        store.query("features", filters=["K LIKE 1"])
+    # Values are bound as parameters, never spliced into the SQL.
+    assert store.query("features", filters=["name = x'; DROP TABLE features; --"]).empty
+    with pytest.raises(QueryError):
+        store.query("features", order="-K, name")
+    assert len(store.query("features", filters=["name = src3"])) == 1
+
+
+def test_store_coerces_filter_values_by_column_type(tmp_path):
+    store = ResultsStore(tmp_path / "results.sqlite")
+    frame = scores_frame(5).assign(name=["123", "7", "x", "8.0", "9"])
+    store.write_scores(frame, model_id="m1")
+    assert store.query(filters=["name = 123"])["name"].tolist() == ["123"]
+    assert store.query(filters=["name = 8.0"])["name"].tolist() == ["8.0"]
+    assert store.query(filters=["row = 2.0"])["name"].tolist() == ["x"]
+    assert len(store.query(filters=["B >= 3"], limit=None)) == 5
+    with pytest.raises(QueryError):
+        store.query(filters=["K > high"])
+
+
+def test_store_skips_runs_already_recorded_under_their_key(tmp_path):
+    store = ResultsStore(tmp_path / "results.sqlite")
+    first = store.write_scores(scores_frame(), model_id="m1", run_key="k1")
+    assert store.write_scores(scores_frame(), model_id="m1", run_key="k1") == first
+    assert store.find_run("scores", "k1") == first
+    assert store.find_run("features", "k1") is None
+    store.write_scores(scores_frame(), model_id="m1")
+    assert list(store.runs("scores")["rows"]) == [100, 100]
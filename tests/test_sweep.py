@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from hei_seti.sweep import SweepRunner, expand_grid, topk_overlap
+
+
+def test_expand_grid_and_overlap():
+    combos = expand_grid({"n_estimators": [10, 20], "max_samples": ["auto", 16]})
+    assert len(combos) == 4
+    assert {"n_estimators": 20, "max_samples": 16} in combos
+    with pytest.raises(KeyError):
+        expand_grid({"bogus": [1]})
+    assert topk_overlap([np.array([1, 2]), np.array([2, 3])]) == pytest.approx(1 / 3)
+    assert topk_overlap([np.array([1, 2])]) == 1.0
+
+
+def test_sweep_runner_reports_timings_and_stability():
+    matrix = np.random.default_rng(0).normal(size=(64, 7))
+    runner = SweepRunner(
+        grid={"n_estimators": [10, 20], "contamination": [0.1]},
+        seeds=[0, 1],
+        top_k=5,
+        n_jobs=2,
+    )
+    report = runner.run(matrix)
+    assert len(report) == 2
+    assert set(report["seeds"]) == {2}
+    assert (report["fit_time_mean"] > 0).all()
+    assert report["topk_overlap"].between(0, 1).all()
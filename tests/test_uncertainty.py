@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from hei_seti.heuristics import KBarrowCalculator
+from hei_seti.uncertainty import KardashevUncertainty
+
+
+def test_power_watts_array_matches_row_estimate():
+    calc = KBarrowCalculator(distance_col="distance_kpc")
+    rows = pd.DataFrame({"flux": [1e-9, 2e-10, 3e-11], "distance_kpc": [5.0, np.nan, 0.5]})
+    expected = [calc.estimate_power_watts(row) for _, row in rows.iterrows()]
+    vectorised = calc.power_watts_array(rows["flux"].to_numpy(), rows["distance_kpc"].to_numpy())
+    np.testing.assert_allclose(vectorised, expected)
+
+
+def test_zero_errors_reproduce_point_estimate():
+    calc = KBarrowCalculator(distance_col="distance_kpc")
+    frame = pd.DataFrame(
+        {
+            "flux": [1e-9, 4e-10],
+            "flux_err": [0.0, 0.0],
+            "distance_kpc": [2.0, 8.0],
+            "distance_err_kpc": [0.0, 0.0],
+        }
+    )
+    summary = KardashevUncertainty(calculator=calc, n_samples=64).summarize(frame)
+    expected = [calc.kardashev(row) for _, row in frame.iterrows()]
+    np.testing.assert_allclose(summary["K_mean"], expected)
+    np.testing.assert_allclose(summary["K_std"], 0.0, atol=1e-12)
+
+
+def test_unknown_distance_widens_interval_and_chunks_cover_rows():
+    calc = KBarrowCalculator(distance_col="distance_kpc")
+    frame = pd.DataFrame(
+        {
+            "flux": [1e-9] * 5 + [np.nan],
+            "distance_kpc": [5.0, np.nan, 5.0, np.nan, 5.0, 5.0],
+        }
+    )
+    propagator = KardashevUncertainty(calculator=calc, n_samples=2000, chunk_size=2, seed=1)
+    summary = propagator.summarize(frame)
+    assert list(summary.columns) == [
+        "K_mean", "K_std", "K_p16", "K_p50", "K_p84", "distance_from_prior"
+    ]
+    assert list(summary["distance_from_prior"]) == [False, True, False, True, False, False]
+    assert summary["K_mean"].iloc[:5].notna().all()
+    assert np.isnan(summary["K_mean"].iloc[5])
+    assert (summary["K_p16"] <= summary["K_p84"]).iloc[:5].all()
+    assert summary["K_std"].iloc[1] > summary["K_std"].iloc[0]